@@ -1,12 +1,13 @@
 """Main entry point for the document assistant."""
 
+import logging
 import os
 import sys
 from pathlib import Path
 from typing import Optional
 
 from src.assistant import DocumentAssistant
-from src.config import get_default_llm
+from src.config import get_default_llm, get_utility_llm
 
 
 def print_welcome():
@@ -95,12 +96,47 @@ def handle_command(command: str, assistant: DocumentAssistant) -> bool:
     return True
 
 
+def piped_mode(assistant: DocumentAssistant):
+    """Process newline-delimited queries from piped stdin.
+
+    Reads stdin with Python's buffered line iterator and writes one answer
+    per line, flushing once per turn — no prompts or banners, so the
+    output stays machine-friendly for `python main.py < prompts.txt`.
+
+    Args:
+        assistant: Document assistant instance
+    """
+    assistant.start_session()
+    out = sys.stdout
+
+    for line in sys.stdin:
+        user_input = line.strip()
+
+        if not user_input:
+            continue
+
+        # Handle commands
+        if user_input.startswith("/"):
+            if not handle_command(user_input, assistant):
+                break
+            continue
+
+        answer = assistant.query(user_input)
+        out.write(answer + "\n")
+        out.flush()
+
+
 def interactive_mode(assistant: DocumentAssistant):
     """Run the assistant in interactive mode.
 
     Args:
         assistant: Document assistant instance
     """
+    # Piped batch input doesn't need the interactive REPL machinery
+    if not sys.stdin.isatty():
+        piped_mode(assistant)
+        return
+
     print_welcome()
 
     # Start a new session
@@ -122,10 +158,11 @@ def interactive_mode(assistant: DocumentAssistant):
                     break
                 continue
 
-            # Process query
+            # Process query, rendering the answer as it streams
             print("\nAssistant: ", end="", flush=True)
-            answer = assistant.query(user_input)
-            print(answer + "\n")
+            for chunk in assistant.stream_query(user_input):
+                print(chunk, end="", flush=True)
+            print("\n")
 
         except KeyboardInterrupt:
             print("\n\nInterrupted. Type /quit to exit.\n")
@@ -138,6 +175,10 @@ def interactive_mode(assistant: DocumentAssistant):
 
 def main():
     """Main function."""
+    # Logging is configured here, at the entrypoint; library modules only
+    # create loggers and leave handlers/levels to the application
+    logging.basicConfig(level=logging.INFO)
+
     # Check for document path argument
     document_path = None
     if len(sys.argv) > 1:
@@ -149,17 +190,21 @@ def main():
     # Initialize LLM with Vocareum configuration
     try:
         llm = get_default_llm()
+        # Cheaper model for utility work (intent classification, summaries)
+        utility_llm = get_utility_llm()
         print("LLM initialized successfully with Vocareum endpoint")
     except ValueError as e:
         print(f"Warning: {e}")
         print("Running without LLM - only basic functionality will be available")
         llm = None
+        utility_llm = None
 
     # Initialize assistant
     assistant = DocumentAssistant(
         document_path=document_path,
         session_dir="sessions",
-        llm=llm
+        llm=llm,
+        utility_llm=utility_llm
     )
 
     # Load documents if path provided
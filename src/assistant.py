@@ -1,15 +1,46 @@
 """Main agent for the document assistant."""
 
+import hashlib
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+import time
 import uuid
 
+try:
+    import orjson
+except ImportError:
+    # Optional: stdlib json works everywhere, orjson is just faster
+    orjson = None
+
 from src.schemas import Message, Session, Document, AnswerResponse
 from src.retrieval import DocumentRetriever
-from src.agent import create_workflow
-from src.tools import create_agent_tools
+from src.agent import create_workflow, FINAL_ANSWER_TAG
+from src.semantic_cache import SemanticCache
+from src.tools import create_agent_tools, set_log_session
+
+# Full-session snapshots are taken every N turns; between snapshots only
+# the new turn's messages are appended to the session's rollout log
+SNAPSHOT_EVERY_TURNS = 10
+
+
+def _json_line(obj: Any) -> str:
+    """Serialize an object to a compact single-line JSON string.
+
+    Uses orjson when available — severalfold faster than stdlib json on
+    the per-turn persistence path — and falls back to json otherwise.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        JSON string without trailing newline
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
 
 
 class DocumentAssistant:
@@ -19,7 +50,8 @@ class DocumentAssistant:
         self,
         document_path: Optional[str] = None,
         session_dir: str = "sessions",
-        llm=None
+        llm=None,
+        utility_llm=None
     ):
         """Initialize the document assistant.
 
@@ -27,15 +59,31 @@ class DocumentAssistant:
             document_path: Path to documents directory
             session_dir: Directory to save sessions
             llm: Language model instance (optional)
+            utility_llm: Cheaper model for classification and summaries (optional)
         """
         self.retriever = DocumentRetriever(document_path)
-        self.workflow = create_workflow(self.retriever)
-        self.tools = create_agent_tools(self.retriever)
         self.session_dir = Path(session_dir)
         self.session_dir.mkdir(exist_ok=True)
+        self.workflow = create_workflow(
+            self.retriever,
+            checkpoint_path=str(self.session_dir / "checkpoints.db")
+        )
+        self.tools = create_agent_tools(self.retriever)
 
         self.current_session: Optional[Session] = None
+        # Graph-ready {"role", "content"} dicts maintained alongside the
+        # session messages, so each turn slices instead of rebuilding O(N)
+        self._history_dicts: List[Dict[str, str]] = []
         self.llm = llm
+        self.utility_llm = utility_llm
+        self.response_cache = SemanticCache()
+        self._rollout_path: Optional[Path] = None
+        # content hash -> id in the sibling contents file; repeated message
+        # bodies (cache hits, canned answers) are logged once and referenced
+        self._contents_path: Optional[Path] = None
+        self._content_table: Dict[str, int] = {}
+        self._turns_since_snapshot = 0
+        self._session_list_cache: Optional[List[str]] = None
 
     def load_documents(self, path: Optional[str] = None) -> int:
         """Load documents from a path.
@@ -66,8 +114,17 @@ class DocumentAssistant:
         self.current_session = Session(
             session_id=session_id,
             messages=[],
-            metadata={"created_at": datetime.now().isoformat()}
+            metadata={"created_at": time.time_ns()}
         )
+        self._history_dicts = []
+
+        # Fresh rollout log for the new session
+        self._rollout_path = self.session_dir / f"{session_id}.jsonl"
+        self._rollout_path.unlink(missing_ok=True)
+        self._contents_path = self.session_dir / f"{session_id}.contents.jsonl"
+        self._contents_path.unlink(missing_ok=True)
+        self._content_table = {}
+        self._turns_since_snapshot = 0
 
         return session_id
 
@@ -87,15 +144,125 @@ class DocumentAssistant:
             return False
 
         try:
-            with open(session_file, 'r') as f:
-                data = json.load(f)
-                self.current_session = Session(**data)
+            if orjson is not None:
+                data = orjson.loads(session_file.read_bytes())
+            else:
+                with open(session_file, 'r') as f:
+                    data = json.load(f)
+            self.current_session = Session(**data)
+
+            # Replay rollout messages appended after the last snapshot,
+            # resolving deduplicated bodies against the contents file
+            self._rollout_path = self.session_dir / f"{session_id}.jsonl"
+            self._contents_path = self.session_dir / f"{session_id}.contents.jsonl"
+            if self._rollout_path.exists():
+                loads = orjson.loads if orjson is not None else json.loads
+                contents: Dict[int, str] = {}
+                if self._contents_path.exists():
+                    with open(self._contents_path, 'r') as f:
+                        for line in f:
+                            if line.strip():
+                                ref, content = loads(line)
+                                contents[ref] = content
+                logged = []
+                with open(self._rollout_path, 'r') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        data = loads(line)
+                        if "content_ref" in data:
+                            data["content"] = contents[data.pop("content_ref")]
+                        logged.append(Message(**data))
+                if len(logged) > len(self.current_session.messages):
+                    self.current_session.messages = logged
+            # Rewrite the rollout so it holds the full history again
+            self._rewrite_rollout()
+            self._turns_since_snapshot = 0
+
+            # Rebuild the parallel history dicts once, then append per turn
+            self._history_dicts = [
+                {"role": msg.role, "content": msg.content}
+                for msg in self.current_session.messages
+            ]
+
             print(f"Loaded session {session_id}")
             return True
         except Exception as e:
             print(f"Error loading session: {e}")
             return False
 
+    def _rollout_line(self, msg: Message) -> str:
+        """Serialize a message for the rollout, deduplicating repeated bodies.
+
+        The first time a content is seen it is appended to the session's
+        contents file under a fresh id and the message is logged in full;
+        later repeats (cache hits, canned answers) log only a content_ref.
+
+        Args:
+            msg: Message to serialize
+
+        Returns:
+            Rollout JSON line without trailing newline
+        """
+        data = msg.model_dump()
+        content_hash = hashlib.blake2b(msg.content.encode(), digest_size=8).hexdigest()
+        ref = self._content_table.get(content_hash)
+        if ref is not None:
+            del data["content"]
+            data["content_ref"] = ref
+        else:
+            ref = len(self._content_table)
+            self._content_table[content_hash] = ref
+            with open(self._contents_path, 'a') as f:
+                f.write(_json_line([ref, msg.content]) + "\n")
+        return _json_line(data)
+
+    def _rewrite_rollout(self) -> None:
+        """Rewrite the rollout log to match the current session in full."""
+        if not self.current_session or self._rollout_path is None:
+            return
+        try:
+            self._content_table = {}
+            self._contents_path.unlink(missing_ok=True)
+            with open(self._rollout_path, 'w') as f:
+                for msg in self.current_session.messages:
+                    f.write(self._rollout_line(msg) + "\n")
+        except Exception as e:
+            print(f"Error writing session rollout: {e}")
+
+    def _persist_turn(self, *messages: Message) -> None:
+        """Persist a turn's new messages without rewriting the session.
+
+        Appends only the turn's delta to the session's rollout log — O(1)
+        in conversation length — and takes a full snapshot via save_session
+        every SNAPSHOT_EVERY_TURNS turns. load_session replays the rollout,
+        so nothing is lost between snapshots.
+
+        Args:
+            messages: The turn's new messages, in order
+        """
+        if not self.current_session:
+            return
+
+        if self._rollout_path is None:
+            self._rollout_path = self.session_dir / f"{self.current_session.session_id}.jsonl"
+            self._contents_path = self.session_dir / f"{self.current_session.session_id}.contents.jsonl"
+
+        try:
+            with open(self._rollout_path, 'a') as f:
+                for msg in messages:
+                    f.write(self._rollout_line(msg) + "\n")
+        except Exception as e:
+            # Fall back to a full snapshot rather than losing the turn
+            print(f"Error appending to session rollout: {e}")
+            self.save_session()
+            return
+
+        self._turns_since_snapshot += 1
+        if self._turns_since_snapshot >= SNAPSHOT_EVERY_TURNS:
+            if self.save_session():
+                self._turns_since_snapshot = 0
+
     def save_session(self) -> bool:
         """Save the current session.
 
@@ -107,10 +274,24 @@ class DocumentAssistant:
             return False
 
         session_file = self.session_dir / f"{self.current_session.session_id}.json"
+        is_new_file = not session_file.exists()
 
         try:
-            with open(session_file, 'w') as f:
-                json.dump(self.current_session.model_dump(), f, indent=2)
+            # Write to a sibling temp file and rename over the target so a
+            # crash mid-write never leaves a truncated snapshot; durability
+            # is left to the OS flush (no per-turn fsync)
+            tmp_file = session_file.with_suffix(session_file.suffix + ".tmp")
+            if orjson is not None:
+                tmp_file.write_bytes(
+                    orjson.dumps(self.current_session.model_dump(), option=orjson.OPT_INDENT_2)
+                )
+            else:
+                with open(tmp_file, 'w') as f:
+                    json.dump(self.current_session.model_dump(), f, indent=2)
+            os.replace(tmp_file, session_file)
+            if is_new_file:
+                # A new session file appeared; the directory listing changed
+                self._session_list_cache = None
             return True
         except Exception as e:
             print(f"Error saving session: {e}")
@@ -128,20 +309,37 @@ class DocumentAssistant:
         # Ensure we have a session
         if not self.current_session:
             self.start_session()
+        set_log_session(self.current_session.session_id)
 
         # Add user message to session
         user_message = Message(
             role="user",
             content=user_input,
-            timestamp=datetime.now().isoformat()
+            timestamp=time.time_ns()
         )
         self.current_session.messages.append(user_message)
-
-        # Prepare message history for the graph
-        messages = [
-            {"role": msg.role, "content": msg.content}
-            for msg in self.current_session.messages[:-1]  # Exclude current message
-        ]
+        self._history_dicts.append({"role": "user", "content": user_input})
+
+        # With no documents loaded every intent ends in empty retrieval,
+        # so skip the workflow (and its LLM calls) entirely
+        if self.retriever.get_document_count() == 0:
+            answer = (
+                "No documents have been loaded yet. "
+                "Load documents with /load <path> or add_document() before asking questions."
+            )
+            assistant_message = Message(
+                role="assistant",
+                content=answer,
+                timestamp=time.time_ns()
+            )
+            self.current_session.messages.append(assistant_message)
+            self._history_dicts.append({"role": "assistant", "content": answer})
+            self._persist_turn(user_message, assistant_message)
+            return answer
+
+        # History for the graph: slice of the maintained dicts, excluding
+        # the current message — O(1) per turn instead of an O(N) rebuild
+        messages = self._history_dicts[:-1]
 
         # Prepare initial state
         initial_state = {
@@ -163,14 +361,19 @@ class DocumentAssistant:
             "configurable": {
                 "thread_id": self.current_session.session_id,
                 "llm": self.llm,
-                "tools": self.tools
+                "utility_llm": self.utility_llm,
+                "tools": self.tools,
+                "retriever": self.retriever,
+                "response_cache": self.response_cache
             }
         }
 
         # Run through the workflow
         try:
             # Invoke the workflow
-            final_state = self.workflow.invoke(initial_state, config)
+            # Persist the checkpoint once at workflow exit instead of
+            # after every node, cutting per-node checkpointer writes
+            final_state = self.workflow.invoke(initial_state, config, durability="exit")
 
             # Extract the response
             current_response = final_state.get("current_response")
@@ -191,14 +394,218 @@ class DocumentAssistant:
         assistant_message = Message(
             role="assistant",
             content=answer,
-            timestamp=datetime.now().isoformat()
+            timestamp=time.time_ns()
+        )
+        self.current_session.messages.append(assistant_message)
+        self._history_dicts.append({"role": "assistant", "content": answer})
+
+        # Persist just this turn's delta; snapshots happen every few turns
+        self._persist_turn(user_message, assistant_message)
+
+        return answer
+
+    def stream_query(self, user_input: str):
+        """Process a user message, yielding response text incrementally.
+
+        Streams the answer text as the workflow produces it instead of
+        blocking until the full structured response is assembled, cutting
+        perceived latency to time-to-first-token. Session bookkeeping
+        matches process_message.
+
+        Args:
+            user_input: User's question or request
+
+        Yields:
+            Chunks of the assistant's response text
+        """
+        # Ensure we have a session
+        if not self.current_session:
+            self.start_session()
+        set_log_session(self.current_session.session_id)
+
+        # Add user message to session
+        user_message = Message(
+            role="user",
+            content=user_input,
+            timestamp=time.time_ns()
+        )
+        self.current_session.messages.append(user_message)
+        self._history_dicts.append({"role": "user", "content": user_input})
+
+        # History for the graph: slice of the maintained dicts, excluding
+        # the current message — O(1) per turn instead of an O(N) rebuild
+        messages = self._history_dicts[:-1]
+
+        initial_state = {
+            "user_input": user_input,
+            "messages": messages,
+            "intent": None,
+            "next_step": None,
+            "conversation_summary": "",
+            "active_documents": [],
+            "current_response": None,
+            "tools_used": [],
+            "session_id": self.current_session.session_id,
+            "user_id": "default_user",
+            "actions_taken": []
+        }
+
+        config = {
+            "configurable": {
+                "thread_id": self.current_session.session_id,
+                "llm": self.llm,
+                "utility_llm": self.utility_llm,
+                "tools": self.tools,
+                "retriever": self.retriever,
+                "response_cache": self.response_cache
+            }
+        }
+
+        answer_parts = []
+        final_state = None
+
+        try:
+            # "messages" yields LLM output as it is produced inside nodes;
+            # "values" carries the final state for session bookkeeping
+            for mode, payload in self.workflow.stream(
+                initial_state, config, stream_mode=["messages", "values"], durability="exit"
+            ):
+                if mode == "values":
+                    final_state = payload
+                    continue
+
+                chunk, metadata = payload
+                # Only surface the tagged final-answer pass: the planner
+                # call in the same node also streams content, and when a
+                # grounding pass follows, its chunks are superseded text
+                if FINAL_ANSWER_TAG not in (metadata.get("tags") or ()):
+                    continue
+                content = getattr(chunk, "content", None)
+                if content:
+                    text = str(content)
+                    answer_parts.append(text)
+                    yield text
+
+            answer = "".join(answer_parts)
+
+            # Fallback when nothing streamed (e.g. cache hit, no-LLM path,
+            # or an untagged answer: the planner's direct reply or the
+            # single-tool fast path skip the final-answer invocation)
+            if not answer and final_state is not None:
+                current_response = final_state.get("current_response")
+                if isinstance(current_response, AnswerResponse):
+                    answer = current_response.answer
+                elif isinstance(current_response, dict):
+                    answer = current_response.get("answer", "I couldn't generate an answer.")
+                else:
+                    answer = str(current_response) if current_response else "I couldn't generate an answer."
+                yield answer
+
+        except Exception as e:
+            answer = f"Error processing query: {e}"
+            import traceback
+            traceback.print_exc()
+            yield answer
+
+        # Add assistant message to session
+        assistant_message = Message(
+            role="assistant",
+            content=answer,
+            timestamp=time.time_ns()
         )
         self.current_session.messages.append(assistant_message)
+        self._history_dicts.append({"role": "assistant", "content": answer})
+
+        # Persist just this turn's delta; snapshots happen every few turns
+        self._persist_turn(user_message, assistant_message)
+
+    def batch_query(self, inputs: List[str], max_concurrency: int = 8) -> List[str]:
+        """Process multiple queries concurrently through the workflow.
+
+        LLM calls are I/O-bound, so running the workflow for each input on a
+        thread pool overlaps the network waits. Results are returned in input
+        order, and each exchange is recorded in the session afterwards.
+
+        Args:
+            inputs: List of user queries
+            max_concurrency: Maximum number of concurrent workflow runs
+
+        Returns:
+            List of assistant responses, one per input, in input order
+        """
+        if not inputs:
+            return []
+
+        # Fast path: a single input doesn't need pool overhead
+        if len(inputs) == 1:
+            return [self.process_message(inputs[0])]
+
+        # Ensure we have a session
+        if not self.current_session:
+            self.start_session()
+
+        # Snapshot the history once; concurrent runs share the same context
+        messages = list(self._history_dicts)
+
+        def run_one(indexed_input):
+            index, user_input = indexed_input
+            initial_state = {
+                "user_input": user_input,
+                "messages": messages,
+                "intent": None,
+                "next_step": None,
+                "conversation_summary": "",
+                "active_documents": [],
+                "current_response": None,
+                "tools_used": [],
+                "session_id": self.current_session.session_id,
+                "user_id": "default_user",
+                "actions_taken": []
+            }
+            # Separate thread_id per input so checkpointer states don't collide
+            config = {
+                "configurable": {
+                    "thread_id": f"{self.current_session.session_id}-batch-{index}",
+                    "llm": self.llm,
+                    "utility_llm": self.utility_llm,
+                    "tools": self.tools,
+                    "retriever": self.retriever,
+                    "response_cache": self.response_cache
+                }
+            }
+
+            try:
+                final_state = self.workflow.invoke(initial_state, config, durability="exit")
+                current_response = final_state.get("current_response")
+
+                if isinstance(current_response, AnswerResponse):
+                    return current_response.answer
+                elif isinstance(current_response, dict):
+                    return current_response.get("answer", "I couldn't generate an answer.")
+                else:
+                    return str(current_response) if current_response else "I couldn't generate an answer."
+            except Exception as e:
+                return f"Error processing query: {e}"
+
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(inputs))) as executor:
+            answers = list(executor.map(run_one, enumerate(inputs)))
+
+        # Record the exchanges in input order once all runs complete
+        for user_input, answer in zip(inputs, answers):
+            timestamp = time.time_ns()
+            self.current_session.messages.append(
+                Message(role="user", content=user_input, timestamp=timestamp)
+            )
+            self.current_session.messages.append(
+                Message(role="assistant", content=answer, timestamp=timestamp)
+            )
+            self._history_dicts.append({"role": "user", "content": user_input})
+            self._history_dicts.append({"role": "assistant", "content": answer})
 
         # Auto-save session
         self.save_session()
 
-        return answer
+        return answers
 
     def query(self, user_query: str) -> str:
         """Process a user query (legacy method, calls process_message).
@@ -224,15 +631,25 @@ class DocumentAssistant:
     def clear_session(self) -> None:
         """Clear the current session."""
         self.current_session = None
+        self._history_dicts = []
 
     def list_sessions(self) -> List[str]:
         """List all saved session IDs.
 
+        The listing comes from a single os.scandir pass (no per-file Path
+        objects) and is cached until a new session file is created, so
+        get_stats() doesn't rescan the directory every call.
+
         Returns:
             List of session IDs
         """
-        session_files = self.session_dir.glob("*.json")
-        return [f.stem for f in session_files]
+        if self._session_list_cache is None:
+            with os.scandir(self.session_dir) as entries:
+                self._session_list_cache = [
+                    entry.name[:-5] for entry in entries
+                    if entry.name.endswith(".json") and entry.is_file(follow_symlinks=False)
+                ]
+        return list(self._session_list_cache)
 
     def add_document(self, content: str, source: str, metadata: Optional[Dict[str, Any]] = None) -> None:
         """Add a document to the retriever.
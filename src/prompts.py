@@ -1,9 +1,15 @@
 """Prompt templates for the document assistant."""
 
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple
 from src.schemas import Document
 from langchain_core.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, MessagesPlaceholder, HumanMessagePromptTemplate
 
+# Shared message-template singletons; identical across all chat prompts,
+# so there is no reason to rebuild them per template
+_MSGS_PLACEHOLDER = MessagesPlaceholder(variable_name="messages")
+_HUMAN_TEMPLATE = HumanMessagePromptTemplate.from_template("{user_input}")
+
 
 class PromptTemplates:
     """Collection of prompt templates for the assistant."""
@@ -143,6 +149,55 @@ Provide a summary that:
 
 Summary:"""
 
+    # System prompts wrapped once at class-load time; from_template
+    # re-parses the template braces, which has no place on the hot path
+    _SYS_TEMPLATES = {
+        "qa": SystemMessagePromptTemplate.from_template(QA_SYSTEM_PROMPT),
+        "summarization": SystemMessagePromptTemplate.from_template(SUMMARIZATION_SYSTEM_PROMPT),
+        "calculation": SystemMessagePromptTemplate.from_template(CALCULATION_SYSTEM_PROMPT),
+    }
+
+    @staticmethod
+    def _format_documents(documents: List[Document]) -> str:
+        """Format documents into a numbered context block.
+
+        A single generator-fed join keeps allocations at one fragment per
+        document instead of building intermediate lists.
+
+        Args:
+            documents: Documents to format
+
+        Returns:
+            Formatted context block
+        """
+        return "\n".join(
+            f"[Document {i}] (Source: {doc.source or 'Unknown'})\n{doc.content}\n"
+            for i, doc in enumerate(documents, 1)
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _split_template(template: str, *slots: str) -> Tuple[str, ...]:
+        """Split a template into static segments around its slots, once.
+
+        Joining the cached segments with the dynamic values avoids
+        str.format's per-call template parsing.
+
+        Args:
+            template: Template string containing the slots
+            slots: Placeholder strings, in template order
+
+        Returns:
+            Tuple of static segments (one more than there are slots)
+        """
+        segments = []
+        rest = template
+        for slot in slots:
+            head, rest = rest.split(slot, 1)
+            segments.append(head)
+        segments.append(rest)
+        return tuple(segments)
+
     @staticmethod
     def format_rag_prompt(query: str, documents: List[Document]) -> str:
         """Format the RAG prompt with query and documents.
@@ -154,15 +209,11 @@ Summary:"""
         Returns:
             Formatted prompt
         """
-        context_parts = []
-        for i, doc in enumerate(documents, 1):
-            source = doc.source or "Unknown"
-            context_parts.append(
-                f"[Document {i}] (Source: {source})\n{doc.content}\n"
-            )
-
-        context = "\n".join(context_parts)
-        return PromptTemplates.RAG_PROMPT.format(query=query, context=context)
+        context = PromptTemplates._format_documents(documents)
+        head, middle, tail = PromptTemplates._split_template(
+            PromptTemplates.RAG_PROMPT, "{query}", "{context}"
+        )
+        return "".join((head, query, middle, context, tail))
 
     @staticmethod
     def format_conversation_prompt(
@@ -181,29 +232,18 @@ Summary:"""
             Formatted prompt
         """
         # Format history
-        history_parts = []
-        for msg in history[-5:]:  # Last 5 messages
-            role = msg.get("role", "unknown")
-            content = msg.get("content", "")
-            history_parts.append(f"{role.capitalize()}: {content}")
-
-        history_str = "\n".join(history_parts) if history_parts else "No previous conversation."
+        history_str = "\n".join(
+            f"{msg.get('role', 'unknown').capitalize()}: {msg.get('content', '')}"
+            for msg in history[-5:]  # Last 5 messages
+        ) or "No previous conversation."
 
         # Format documents
-        context_parts = []
-        for i, doc in enumerate(documents, 1):
-            source = doc.source or "Unknown"
-            context_parts.append(
-                f"[Document {i}] (Source: {source})\n{doc.content}\n"
-            )
-
-        context = "\n".join(context_parts) if context_parts else "No relevant documents found."
+        context = PromptTemplates._format_documents(documents) or "No relevant documents found."
 
-        return PromptTemplates.CONVERSATION_PROMPT.format(
-            history=history_str,
-            query=query,
-            context=context
+        head, after_history, after_query, tail = PromptTemplates._split_template(
+            PromptTemplates.CONVERSATION_PROMPT, "{history}", "{query}", "{context}"
         )
+        return "".join((head, history_str, after_history, query, after_query, context, tail))
 
     @staticmethod
     def format_query_analysis_prompt(query: str) -> str:
@@ -227,15 +267,28 @@ Summary:"""
         Returns:
             Formatted prompt
         """
-        doc_parts = []
-        for i, doc in enumerate(documents, 1):
-            source = doc.source or "Unknown"
-            doc_parts.append(
-                f"[Document {i}] (Source: {source})\n{doc.content}\n"
-            )
+        documents_str = PromptTemplates._format_documents(documents)
+        head, tail = PromptTemplates._split_template(
+            PromptTemplates.SUMMARY_PROMPT, "{documents}"
+        )
+        return "".join((head, documents_str, tail))
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _intent_prompt_parts() -> Tuple[str, str, str]:
+        """Split the intent classification template into its static parts.
+
+        Splitting once lets get_intent_classification_prompt assemble the
+        prompt with a single join instead of re-parsing the template's
+        placeholders on every turn.
 
-        documents_str = "\n".join(doc_parts)
-        return PromptTemplates.SUMMARY_PROMPT.format(documents=documents_str)
+        Returns:
+            Tuple of (header, middle, tail) static template segments
+        """
+        template = PromptTemplates.INTENT_CLASSIFICATION_PROMPT
+        header, rest = template.split("{user_input}", 1)
+        middle, tail = rest.split("{conversation_history}", 1)
+        return header, middle, tail
 
     @staticmethod
     def get_intent_classification_prompt(user_input: str, conversation_history: List[Dict[str, Any]] = None) -> str:
@@ -249,46 +302,46 @@ Summary:"""
             Formatted intent classification prompt
         """
         if conversation_history and len(conversation_history) > 0:
-            history_parts = []
-            for msg in conversation_history[-5:]:  # Last 5 messages
-                role = msg.get("role", "unknown")
-                content = msg.get("content", "")
-                history_parts.append(f"{role}: {content}")
-            history_str = "\n".join(history_parts)
+            history_str = "\n".join(
+                f"{msg.get('role', 'unknown')}: {msg.get('content', '')}"
+                for msg in conversation_history[-5:]  # Last 5 messages
+            )
         else:
             history_str = "No previous conversation."
 
-        return PromptTemplates.INTENT_CLASSIFICATION_PROMPT.format(
-            user_input=user_input,
-            conversation_history=history_str
-        )
+        header, middle, tail = PromptTemplates._intent_prompt_parts()
+        return "".join((header, user_input, middle, history_str, tail))
 
     @staticmethod
+    @lru_cache(maxsize=8)
     def get_chat_prompt_template(intent_type: str = "qa") -> ChatPromptTemplate:
         """Get the chat prompt template based on intent type.
 
+        The template is a pure function of the intent type (only three modes
+        exist), so repeated calls on the hot path return a cached instance.
+
         Args:
             intent_type: The type of intent ("qa", "summarization", "calculation")
 
         Returns:
             ChatPromptTemplate object for the given intent type
         """
-        # Select the appropriate system prompt
-        if intent_type == "qa":
-            system_prompt_str = PromptTemplates.QA_SYSTEM_PROMPT
-        elif intent_type == "summarization":
-            system_prompt_str = PromptTemplates.SUMMARIZATION_SYSTEM_PROMPT
-        elif intent_type == "calculation":
-            system_prompt_str = PromptTemplates.CALCULATION_SYSTEM_PROMPT
-        else:
-            # Default to QA prompt for unknown intents
-            system_prompt_str = PromptTemplates.QA_SYSTEM_PROMPT
-
-        # Construct and return the ChatPromptTemplate
-        template = ChatPromptTemplate.from_messages([
-            SystemMessagePromptTemplate.from_template(system_prompt_str),
-            MessagesPlaceholder(variable_name="messages"),  # For conversation history
-            HumanMessagePromptTemplate.from_template("{user_input}")
+        # Look up the prebuilt system template (default to QA for unknown
+        # intents) and compose it with the shared message singletons
+        system_template = PromptTemplates._SYS_TEMPLATES.get(
+            intent_type, PromptTemplates._SYS_TEMPLATES["qa"]
+        )
+
+        return ChatPromptTemplate.from_messages([
+            system_template,
+            _MSGS_PLACEHOLDER,  # For conversation history
+            _HUMAN_TEMPLATE
         ])
-        
-        return template
+
+
+# Warm the memoized templates at import so the first turn doesn't pay
+# template parsing inside a hot node function
+for _intent_type in ("qa", "summarization", "calculation"):
+    PromptTemplates.get_chat_prompt_template(_intent_type)
+PromptTemplates._intent_prompt_parts()
+del _intent_type
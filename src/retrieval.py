@@ -1,10 +1,22 @@
 """Document retrieval module for the assistant."""
 
-from typing import List, Optional, Dict, Any
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Set
 from pathlib import Path
 import json
 
 from src.schemas import Document, Query
+from src.semantic_cache import SemanticCache
+
+# One compiled tokenizer shared by indexing and querying
+_TOKEN_RE = re.compile(r"\w+")
+
+# Similarity threshold for serving a retrieval from the query cache;
+# stricter than the response cache since stale documents are worse than
+# a recomputed ranking
+QUERY_CACHE_THRESHOLD = 0.95
 
 
 class DocumentRetriever:
@@ -18,6 +30,27 @@ class DocumentRetriever:
         """
         self.document_path = document_path
         self.documents: List[Document] = []
+        # Inverted index: token -> indices of documents containing it,
+        # plus per-document token counts. Built incrementally as documents
+        # are added so retrieval never rescans full document text.
+        self._postings: Dict[str, Set[int]] = {}
+        self._token_counts: List[Counter] = []
+        # Near-duplicate queries (common in conversational use) serve the
+        # cached ranking instead of re-searching; invalidated whenever the
+        # corpus changes
+        self._query_cache = SemanticCache(ttl_seconds=300.0, max_entries=128)
+
+    def _index_document(self, document: Document) -> None:
+        """Add a document's tokens to the index.
+
+        Args:
+            document: Document to index
+        """
+        doc_index = len(self._token_counts)
+        counts = Counter(_TOKEN_RE.findall(document.content.lower()))
+        self._token_counts.append(counts)
+        for token in counts:
+            self._postings.setdefault(token, set()).add(doc_index)
 
     def load_documents(self, path: Optional[str] = None) -> None:
         """Load documents from a specified path.
@@ -48,19 +81,48 @@ class DocumentRetriever:
                 source=str(file_path),
                 metadata={"filename": file_path.name, "extension": file_path.suffix}
             )
-            self.documents.append(doc)
+            self.add_document(doc)
         except Exception as e:
             print(f"Error loading file {file_path}: {e}")
 
     def _load_directory(self, dir_path: Path) -> None:
         """Load all documents from a directory.
 
+        File reads are I/O-bound (read_text releases the GIL), so they fan
+        out over a thread pool; documents are appended on the calling thread
+        in path order to keep the index single-writer.
+
         Args:
             dir_path: Path to the directory
         """
-        for file_path in dir_path.rglob("*"):
-            if file_path.is_file() and file_path.suffix in ['.txt', '.md', '.json', '.csv']:
-                self._load_single_file(file_path)
+        candidates = [
+            file_path for file_path in dir_path.rglob("*")
+            if file_path.is_file() and file_path.suffix in {'.txt', '.md', '.json', '.csv'}
+        ]
+        if not candidates:
+            return
+
+        def read_one(file_path: Path) -> Optional[str]:
+            try:
+                return file_path.read_text(encoding='utf-8')
+            except Exception as e:
+                print(f"Error loading file {file_path}: {e}")
+                return None
+
+        if len(candidates) == 1:
+            contents = [read_one(candidates[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(32, len(candidates))) as executor:
+                contents = list(executor.map(read_one, candidates))
+
+        for file_path, content in zip(candidates, contents):
+            if content is None:
+                continue
+            self.add_document(Document(
+                content=content,
+                source=str(file_path),
+                metadata={"filename": file_path.name, "extension": file_path.suffix}
+            ))
 
     def retrieve(self, query: Query, top_k: int = 5) -> List[Document]:
         """Retrieve relevant documents for a query.
@@ -72,35 +134,57 @@ class DocumentRetriever:
         Returns:
             List of relevant documents
         """
-        # Simple keyword-based retrieval (can be enhanced with embeddings)
-        query_terms = query.text.lower().split()
-        scored_docs = []
-
-        for doc in self.documents:
-            score = self._calculate_score(doc.content.lower(), query_terms)
-            if score > 0:
-                doc_copy = doc.model_copy()
-                doc_copy.score = score
-                scored_docs.append(doc_copy)
+        return self.retrieve_text(query.text, top_k=top_k)
 
-        # Sort by score and return top_k
-        scored_docs.sort(key=lambda x: x.score or 0, reverse=True)
-        return scored_docs[:top_k]
+    def retrieve_text(self, text: str, top_k: int = 5) -> List[Document]:
+        """Retrieve relevant documents for a plain query string.
 
-    def _calculate_score(self, content: str, query_terms: List[str]) -> float:
-        """Calculate relevance score for a document.
+        Fast path for callers that hold a string: skips the Query model
+        construction (and its validation) that retrieve() requires.
+        Scoring runs against the inverted index: only documents containing
+        at least one query term are considered, and each score is a handful
+        of dict lookups instead of a scan over the full document text.
 
         Args:
-            content: Document content
-            query_terms: List of query terms
+            text: Search text
+            top_k: Number of top documents to retrieve
 
         Returns:
-            Relevance score
+            List of relevant documents
         """
-        score = 0.0
+        # Deduplicate once: a term repeated in the query should not count
+        # a document's occurrences twice
+        query_terms = set(_TOKEN_RE.findall(text.lower()))
+        if not query_terms:
+            return []
+
+        # Serve near-duplicate queries from the cache; results are keyed
+        # per top_k so a broader request never gets a narrower cached list
+        cached = self._query_cache.check(
+            text, threshold=QUERY_CACHE_THRESHOLD, session_id=f"top_k={top_k}"
+        )
+        if cached is not None:
+            return [doc.model_copy() for doc in cached]
+
+        # Union of postings narrows scoring to documents with any hit
+        candidates: Set[int] = set()
         for term in query_terms:
-            score += content.count(term)
-        return score
+            candidates |= self._postings.get(term, set())
+
+        scored_docs = []
+        for doc_index in candidates:
+            counts = self._token_counts[doc_index]
+            score = float(sum(counts[term] for term in query_terms))
+            if score > 0:
+                doc_copy = self.documents[doc_index].model_copy()
+                doc_copy.score = score
+                scored_docs.append(doc_copy)
+
+        # Sort by score and return top_k
+        scored_docs.sort(key=lambda x: x.score or 0, reverse=True)
+        top_docs = scored_docs[:top_k]
+        self._query_cache.store(text, top_docs, session_id=f"top_k={top_k}")
+        return top_docs
 
     def add_document(self, document: Document) -> None:
         """Add a document to the retriever.
@@ -109,10 +193,16 @@ class DocumentRetriever:
             document: Document to add
         """
         self.documents.append(document)
+        self._index_document(document)
+        # Cached rankings may no longer be correct
+        self._query_cache.clear()
 
     def clear_documents(self) -> None:
         """Clear all loaded documents."""
         self.documents.clear()
+        self._postings.clear()
+        self._token_counts.clear()
+        self._query_cache.clear()
 
     def get_document_count(self) -> int:
         """Get the number of loaded documents.
@@ -2,7 +2,7 @@
 
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class Document(BaseModel):
@@ -47,9 +47,32 @@ class AgentState(BaseModel):
 class Message(BaseModel):
     """Message model for conversation."""
 
+    # Messages are created fresh per turn and never mutated; freezing skips
+    # assignment machinery and makes instances safely shareable across the
+    # session list, the rollout log, and the graph state
+    model_config = ConfigDict(frozen=True)
+
     role: str = Field(..., description="Message role (user/assistant/system)")
     content: str = Field(..., description="Message content")
-    timestamp: Optional[str] = Field(None, description="Message timestamp")
+    timestamp: Optional[int] = Field(None, description="Message timestamp (nanoseconds since epoch)")
+
+    @field_validator("timestamp", mode="before")
+    @classmethod
+    def _coerce_timestamp(cls, value: Any) -> Any:
+        """Accept legacy ISO-format timestamps from older session files."""
+        if isinstance(value, str):
+            return int(datetime.fromisoformat(value).timestamp() * 1_000_000_000)
+        return value
+
+    def iso_timestamp(self) -> Optional[str]:
+        """Render the timestamp as an ISO-format string, lazily.
+
+        Returns:
+            ISO-format timestamp, or None if the message has no timestamp
+        """
+        if self.timestamp is None:
+            return None
+        return datetime.fromtimestamp(self.timestamp / 1_000_000_000).isoformat()
 
 
 class Session(BaseModel):
@@ -0,0 +1,166 @@
+"""Semantic response cache for the document assistant."""
+
+import sys
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@lru_cache(maxsize=512)
+def _vectorize_cached(text: str) -> Tuple[Dict[str, int], float]:
+    """Vectorize text with memoization.
+
+    The same user inputs and recent messages get re-vectorized on every
+    cache check and store; memoizing by text avoids the repeated tokenize
+    and norm passes. Callers must treat the returned vector as read-only.
+
+    Args:
+        text: Input text
+
+    Returns:
+        Tuple of (term counts, vector norm)
+    """
+    counts: Dict[str, int] = {}
+    for term in text.lower().split():
+        # Interned terms are shared across all cached vectors, shrinking
+        # the store and letting dict lookups hit the pointer-equality
+        # fast path during the cosine scan
+        term = sys.intern(term)
+        counts[term] = counts.get(term, 0) + 1
+    norm = sum(c * c for c in counts.values()) ** 0.5
+    return counts, norm
+
+
+def vectorize_batch(texts: List[str]) -> List[Tuple[Dict[str, int], float]]:
+    """Vectorize a batch of texts in one pass, reusing cached entries.
+
+    Args:
+        texts: Input texts
+
+    Returns:
+        List of (term counts, vector norm) tuples, one per input text
+    """
+    return [_vectorize_cached(text) for text in texts]
+
+
+class SemanticCache:
+    """Caches responses keyed by similarity of the user input.
+
+    Near-duplicate queries skip the LLM round trip entirely: if a stored
+    entry's input is similar enough to the incoming one (cosine similarity
+    over term-frequency vectors, mirroring the keyword scoring used by
+    DocumentRetriever), the cached response is returned instead of running
+    the full workflow.
+
+    Entries are namespaced per (session_id, user_id) and expire after a TTL.
+    """
+
+    def __init__(self, ttl_seconds: float = 3600.0, max_entries: int = 256):
+        """Initialize the semantic cache.
+
+        Args:
+            ttl_seconds: Time-to-live for cached entries in seconds
+            max_entries: Maximum number of entries kept per namespace
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # namespace -> list of (term_vector, norm, response, stored_at)
+        self._entries: Dict[Tuple[str, str], List[Tuple[Dict[str, int], float, Any, float]]] = {}
+
+    @staticmethod
+    def _vectorize(text: str) -> Tuple[Dict[str, int], float]:
+        """Build a term-frequency vector and its euclidean norm.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Tuple of (term counts, vector norm)
+        """
+        return _vectorize_cached(text)
+
+    @staticmethod
+    def _cosine(vec_a: Dict[str, int], norm_a: float, vec_b: Dict[str, int], norm_b: float) -> float:
+        """Compute cosine similarity between two term-frequency vectors.
+
+        Args:
+            vec_a: First term vector
+            norm_a: Norm of the first vector
+            vec_b: Second term vector
+            norm_b: Norm of the second vector
+
+        Returns:
+            Cosine similarity between 0 and 1
+        """
+        if norm_a == 0 or norm_b == 0:
+            return 0.0
+        if len(vec_b) < len(vec_a):
+            vec_a, vec_b = vec_b, vec_a
+        dot = sum(count * vec_b.get(term, 0) for term, count in vec_a.items())
+        return dot / (norm_a * norm_b)
+
+    def check(
+        self,
+        user_input: str,
+        threshold: float = 0.92,
+        session_id: str = "",
+        user_id: str = ""
+    ) -> Optional[Any]:
+        """Look up a cached response for a similar input.
+
+        Args:
+            user_input: The incoming user input
+            threshold: Minimum cosine similarity for a hit
+            session_id: Session namespace
+            user_id: User namespace
+
+        Returns:
+            The cached response on a hit, None on a miss
+        """
+        namespace = (session_id, user_id)
+        entries = self._entries.get(namespace)
+        if not entries:
+            return None
+
+        now = time.monotonic()
+        # Drop expired entries in place
+        entries[:] = [e for e in entries if now - e[3] < self.ttl_seconds]
+
+        query_vec, query_norm = self._vectorize(user_input)
+        best_response = None
+        best_score = threshold
+        for vec, norm, response, _ in entries:
+            score = self._cosine(query_vec, query_norm, vec, norm)
+            if score >= best_score:
+                best_score = score
+                best_response = response
+
+        return best_response
+
+    def store(
+        self,
+        user_input: str,
+        response: Any,
+        session_id: str = "",
+        user_id: str = ""
+    ) -> None:
+        """Store a response for later similarity lookups.
+
+        Args:
+            user_input: The user input that produced the response
+            response: The response to cache
+            session_id: Session namespace
+            user_id: User namespace
+        """
+        namespace = (session_id, user_id)
+        entries = self._entries.setdefault(namespace, [])
+        vec, norm = self._vectorize(user_input)
+        entries.append((vec, norm, response, time.monotonic()))
+
+        # Evict oldest entries beyond the cap
+        if len(entries) > self.max_entries:
+            del entries[:len(entries) - self.max_entries]
+
+    def clear(self) -> None:
+        """Clear all cached entries."""
+        self._entries.clear()
@@ -1,15 +1,35 @@
 """Agent tools for the document assistant."""
 
-from typing import List, Dict, Any, Callable
-import re
+from typing import List, Dict, Any, Callable, Optional
+import ast
+import io
 import logging
+from contextvars import ContextVar
 from langchain.tools import tool
-from src.schemas import Document, Query
+from src.schemas import Document
 from src.retrieval import DocumentRetriever
 
 
-# Setup logging for tool usage
-logging.basicConfig(level=logging.INFO)
+# Module logger; handler/level configuration belongs to the application
+# entrypoint, not library import
+logger = logging.getLogger("tools")
+
+# Longest output rendered into a log line; tool outputs can be whole
+# concatenated documents and nobody reads megabytes of log payload
+_LOG_OUTPUT_CHARS = 256
+
+# Session id for log correlation, carried in context instead of being
+# threaded through every tool call signature
+_log_session: ContextVar[Optional[str]] = ContextVar("tool_log_session", default=None)
+
+
+def set_log_session(session_id: Optional[str]) -> None:
+    """Bind subsequent tool log records to a session.
+
+    Args:
+        session_id: Session identifier, or None to unbind
+    """
+    _log_session.set(session_id)
 
 
 class ToolLogger:
@@ -19,12 +39,29 @@ class ToolLogger:
     def log(tool_name: str, input_data: Any, output: Any):
         """Log tool usage.
 
+        The level guard plus %-style formatting means a disabled logger
+        costs one C-level check — no strings are built for records that
+        are never emitted.
+
         Args:
             tool_name: Name of the tool
             input_data: Input to the tool
             output: Output from the tool
         """
-        logging.info(f"Tool: {tool_name} | Input: {input_data} | Output: {output}")
+        if logger.isEnabledFor(logging.INFO):
+            if isinstance(output, str) and len(output) > _LOG_OUTPUT_CHARS:
+                output = output[:_LOG_OUTPUT_CHARS] + "..."
+            # Fields ride along as record attributes so a structured (JSON)
+            # handler can serialize them without re-parsing the message
+            logger.info(
+                "Tool: %s | Input: %s | Output: %s", tool_name, input_data, output,
+                extra={
+                    "tool": tool_name,
+                    "tool_input": input_data,
+                    "tool_output": output,
+                    "session": _log_session.get(),
+                },
+            )
 
 
 class ToolRegistry:
@@ -55,9 +92,11 @@ class ToolRegistry:
         Raises:
             KeyError: If tool not found
         """
-        if name not in self.tools:
-            raise KeyError(f"Tool '{name}' not found")
-        return self.tools[name]
+        # Single lookup: the membership test hashed the name a second time
+        try:
+            return self.tools[name]
+        except KeyError:
+            raise KeyError(f"Tool '{name}' not found") from None
 
     def list_tools(self) -> List[str]:
         """List all registered tool names.
@@ -89,8 +128,9 @@ class DocumentTools:
         Returns:
             List of relevant documents
         """
-        query_obj = Query(text=query)
-        return self.retriever.retrieve(query_obj, top_k=top_k)
+        # String fast path: the retriever only needs the text, so skip
+        # Query model construction
+        return self.retriever.retrieve_text(query, top_k=top_k)
 
     def get_document_summary(self, documents: List[Document]) -> str:
         """Get a summary of documents.
@@ -104,18 +144,23 @@ class DocumentTools:
         if not documents:
             return "No documents found."
 
-        summary_parts = []
+        # Append into one growing buffer instead of building per-document
+        # f-strings and joining the list afterwards
+        buf = io.StringIO()
         for i, doc in enumerate(documents, 1):
-            source = doc.source or "Unknown"
+            if i > 1:
+                buf.write("\n")
             score = doc.score or 0.0
-            preview = doc.content[:100] + "..." if len(doc.content) > 100 else doc.content
-            summary_parts.append(
-                f"Document {i} (score: {score:.2f}):\n"
-                f"Source: {source}\n"
-                f"Preview: {preview}\n"
-            )
-
-        return "\n".join(summary_parts)
+            buf.write(f"Document {i} (score: {score:.2f}):\nSource: ")
+            buf.write(doc.source or "Unknown")
+            buf.write("\nPreview: ")
+            if len(doc.content) > 100:
+                buf.write(doc.content[:100])
+                buf.write("...")
+            else:
+                buf.write(doc.content)
+            buf.write("\n")
+        return buf.getvalue()
 
     def get_full_context(self, documents: List[Document]) -> str:
         """Get full context from documents.
@@ -129,12 +174,97 @@ class DocumentTools:
         if not documents:
             return ""
 
-        context_parts = []
-        for doc in documents:
+        # Large contexts concatenate whole documents; writing into one
+        # buffer avoids an intermediate f-string copy per document
+        buf = io.StringIO()
+        for i, doc in enumerate(documents):
+            if i:
+                buf.write("\n")
+            buf.write("--- Source: ")
+            buf.write(doc.source or "Unknown")
+            buf.write(" ---\n")
+            buf.write(doc.content)
+            buf.write("\n")
+        return buf.getvalue()
+
+    def format_all(self, documents: List[Document]) -> tuple:
+        """Build the summary and full context in a single pass.
+
+        Callers that need both otherwise walk the document list twice and
+        pay each pydantic attribute access (source, content, score) per
+        walk; here every field is read once and written into both buffers.
+
+        Args:
+            documents: List of documents
+
+        Returns:
+            Tuple of (summary string, full context string)
+        """
+        if not documents:
+            return "No documents found.", ""
+
+        summary_buf = io.StringIO()
+        context_buf = io.StringIO()
+        for i, doc in enumerate(documents, 1):
             source = doc.source or "Unknown"
-            context_parts.append(f"--- Source: {source} ---\n{doc.content}\n")
+            content = doc.content
+            if i > 1:
+                summary_buf.write("\n")
+                context_buf.write("\n")
+
+            summary_buf.write(f"Document {i} (score: {doc.score or 0.0:.2f}):\nSource: ")
+            summary_buf.write(source)
+            summary_buf.write("\nPreview: ")
+            if len(content) > 100:
+                summary_buf.write(content[:100])
+                summary_buf.write("...")
+            else:
+                summary_buf.write(content)
+            summary_buf.write("\n")
+
+            context_buf.write("--- Source: ")
+            context_buf.write(source)
+            context_buf.write(" ---\n")
+            context_buf.write(content)
+            context_buf.write("\n")
+
+        return summary_buf.getvalue(), context_buf.getvalue()
+
+
+# AST nodes permitted in calculator expressions; anything outside this
+# set (names, calls, attributes, subscripts) is rejected before compile
+_CALC_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv,
+    ast.Mod, ast.Pow, ast.USub, ast.UAdd,
+)
+
+
+def _compile_expression(expression: str):
+    """Parse and compile an arithmetic expression to a code object.
+
+    The AST walk whitelists pure-arithmetic nodes, which is stricter than
+    character filtering — there is no way to smuggle a name or call through
+    it — and the compiled code object can be evaluated repeatedly without
+    re-parsing.
 
-        return "\n".join(context_parts)
+    Args:
+        expression: Arithmetic expression to compile
+
+    Returns:
+        Compiled code object for eval
+
+    Raises:
+        SyntaxError: If the expression is not valid Python syntax
+        ValueError: If the expression uses anything beyond arithmetic
+    """
+    tree = ast.parse(expression, mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, _CALC_ALLOWED_NODES):
+            raise ValueError(f"Unsupported operation: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError("Only numeric constants are allowed")
+    return compile(tree, "<calculator>", "eval")
 
 
 def create_calculator_tool():
@@ -143,6 +273,10 @@ def create_calculator_tool():
     Returns:
         Calculator tool function
     """
+    # Results memoized per expression: the whitelisted grammar has no
+    # variables, so every valid expression is a constant and can be
+    # evaluated once — repeats are a single dict lookup, no eval at all
+    _results: Dict[str, Any] = {}
 
     @tool
     def calculator(expression: str) -> str:
@@ -158,18 +292,14 @@ def create_calculator_tool():
             The result of the calculation as a string
         """
         try:
-            # Validate the expression for safety
-            # Only allow: numbers, operators, parentheses, decimal points, and whitespace
-            if not re.match(r'^[\d\s\+\-\*/\(\)\.%]+$', expression):
-                error_msg = f"Invalid expression: {expression}. Only basic math operations are allowed."
-                ToolLogger.log("calculator", expression, error_msg)
-                return error_msg
-
-            # Remove any potential dangerous characters
-            safe_expression = expression.strip()
-
-            # Evaluate the expression
-            result = eval(safe_expression, {"__builtins__": {}}, {})
+            # Compile (whitelist-check) and evaluate once per distinct
+            # expression; errors are not cached, so e.g. division by zero
+            # reports consistently on every call
+            result = _results.get(expression)
+            if result is None:
+                code = _compile_expression(expression.strip())
+                result = eval(code, {"__builtins__": {}}, {})
+                _results[expression] = result
 
             # Format the result
             formatted_result = f"Result: {result}"
@@ -187,6 +317,10 @@ def create_calculator_tool():
             error_msg = f"Error: Invalid syntax in expression '{expression}'"
             ToolLogger.log("calculator", expression, error_msg)
             return error_msg
+        except ValueError:
+            error_msg = f"Invalid expression: {expression}. Only basic math operations are allowed."
+            ToolLogger.log("calculator", expression, error_msg)
+            return error_msg
         except Exception as e:
             error_msg = f"Error evaluating expression: {str(e)}"
             ToolLogger.log("calculator", expression, error_msg)
@@ -219,26 +353,20 @@ def create_document_reader_tool(retriever: DocumentRetriever):
             String containing the retrieved document contents
         """
         try:
-            # Create query object
-            query_obj = Query(text=query)
-
-            # Retrieve documents
-            documents = retriever.retrieve(query_obj, top_k=3)
+            # Retrieve documents (string fast path, no Query construction)
+            documents = retriever.retrieve_text(query, top_k=3)
 
             if not documents:
                 result = "No relevant documents found."
                 ToolLogger.log("document_reader", query, result)
                 return result
 
-            # Format documents
-            doc_parts = []
-            for i, doc in enumerate(documents, 1):
-                source = doc.source or "Unknown"
-                doc_parts.append(
-                    f"[Document {i}] (Source: {source})\n{doc.content}\n"
-                )
-
-            result = "\n".join(doc_parts)
+            # Format documents; the comprehension runs the loop in C with
+            # no per-iteration append lookup
+            result = "\n".join(
+                f"[Document {i}] (Source: {doc.source or 'Unknown'})\n{doc.content}\n"
+                for i, doc in enumerate(documents, 1)
+            )
             ToolLogger.log("document_reader", query, f"Retrieved {len(documents)} document(s)")
 
             return result
@@ -266,6 +394,7 @@ def create_default_tools(retriever: DocumentRetriever) -> ToolRegistry:
     registry.register("search_documents", doc_tools.search_documents)
     registry.register("get_document_summary", doc_tools.get_document_summary)
     registry.register("get_full_context", doc_tools.get_full_context)
+    registry.register("format_all", doc_tools.format_all)
 
     return registry
 
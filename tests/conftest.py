@@ -5,15 +5,18 @@ Pytest configuration and shared fixtures for testing.
 import os
 import sys
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any, List
 from datetime import datetime
 
 import pytest
 from unittest.mock import Mock, MagicMock
 
-# Add project root to path
+# Add project root to path (once; conftest imports before every test
+# module, so individual test files don't need their own insert)
 project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
 from src.schemas import (
     AnswerResponse,
@@ -50,92 +53,101 @@ def test_data_path(project_root_path):
 # ============================================================================
 # Mock LLM Fixtures
 # ============================================================================
+#
+# The LLM stand-ins are plain classes rather than MagicMocks: every
+# MagicMock attribute access runs __getattr__ introspection and creates
+# auto-children, which dominates runtime in tests that drive many agent
+# iterations. Real methods cost a single attribute lookup.
 
-@pytest.fixture
+class _FakeResponse:
+    """Minimal chat-response stand-in (content + tool_calls)."""
+
+    __slots__ = ("content", "tool_calls")
+
+    def __init__(self, content, tool_calls=()):
+        self.content = content
+        self.tool_calls = list(tool_calls)
+
+
+class _FakeStructuredLLM:
+    """Returns a canned instance of the schema it was bound with."""
+
+    __slots__ = ("schema",)
+
+    def __init__(self, schema):
+        self.schema = schema
+
+    def invoke(self, messages):
+        if self.schema == CalculationResponse:
+            return CalculationResponse(
+                expression="10 + 20",
+                result="30",
+                explanation="Simple addition of 10 and 20",
+                sources=["mock_document"],
+                confidence=0.9
+            )
+        if self.schema == SummarizationResponse:
+            return SummarizationResponse(
+                summary="This is a mock summary",
+                key_points=["Point 1", "Point 2", "Point 3"],
+                document_ids=["doc1", "doc2"],
+                confidence=0.85
+            )
+        if self.schema == UserIntent:
+            return UserIntent(
+                intent_type="qa",
+                confidence=0.9,
+                reasoning="Mock intent classification"
+            )
+        return MagicMock()
+
+    def batch(self, inputs, config=None):
+        return [self.invoke(messages) for messages in inputs]
+
+
+class _FakeLLM:
+    """Lightweight LLM stand-in with real methods."""
+
+    __slots__ = ()
+
+    def invoke(self, messages):
+        return _FakeResponse("This is a mock response.")
+
+    def with_structured_output(self, schema, **kwargs):
+        return _FakeStructuredLLM(schema)
+
+    def bind_tools(self, tools):
+        return self
+
+
+class _FakeToolCallingLLM:
+    """LLM stand-in whose responses carry a simulated tool call."""
+
+    __slots__ = ()
+
+    def invoke(self, messages):
+        return _FakeResponse(
+            "Mock response with tool results",
+            tool_calls=[
+                {
+                    'id': 'call_1',
+                    'name': 'read_document',
+                    'args': {'document_id': 'test_doc'}
+                }
+            ]
+        )
+
+
+@pytest.fixture(scope="session")
 def mock_llm():
     """Create a mock LLM for testing."""
-    llm = MagicMock()
-    
-    # Mock invoke method
-    def mock_invoke(messages):
-        response = MagicMock()
-        response.content = "This is a mock response."
-        response.tool_calls = []
-        return response
-    
-    llm.invoke = mock_invoke
-    
-    # Mock with_structured_output method
-    def mock_structured_output(schema, **kwargs):
-        structured_llm = MagicMock()
-        
-        # Return appropriate mock based on schema
-        if schema == CalculationResponse:
-            def calc_invoke(messages):
-                return CalculationResponse(
-                    expression="10 + 20",
-                    result="30",
-                    explanation="Simple addition of 10 and 20",
-                    sources=["mock_document"],
-                    confidence=0.9
-                )
-            structured_llm.invoke = calc_invoke
-        elif schema == SummarizationResponse:
-            def summ_invoke(messages):
-                return SummarizationResponse(
-                    summary="This is a mock summary",
-                    key_points=["Point 1", "Point 2", "Point 3"],
-                    document_ids=["doc1", "doc2"],
-                    confidence=0.85
-                )
-            structured_llm.invoke = summ_invoke
-        elif schema == UserIntent:
-            def intent_invoke(messages):
-                return UserIntent(
-                    intent_type="qa",
-                    confidence=0.9,
-                    reasoning="Mock intent classification"
-                )
-            structured_llm.invoke = intent_invoke
-        else:
-            structured_llm.invoke = lambda x: MagicMock()
-        
-        return structured_llm
-    
-    llm.with_structured_output = mock_structured_output
-    
-    # Mock bind_tools method
-    def mock_bind_tools(tools):
-        bound_llm = MagicMock()
-        bound_llm.invoke = mock_invoke
-        return bound_llm
-    
-    llm.bind_tools = mock_bind_tools
-    
-    return llm
+    return _FakeLLM()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_llm_with_tools():
     """Create a mock LLM that simulates tool calling."""
-    llm = MagicMock()
-    
-    def mock_invoke(messages):
-        response = MagicMock()
-        response.content = "Mock response with tool results"
-        
-        # Simulate tool calls
-        response.tool_calls = [
-            {
-                'id': 'call_1',
-                'name': 'read_document',
-                'args': {'document_id': 'test_doc'}
-            }
-        ]
-        return response
-    
-    llm.invoke = mock_invoke
-    return llm
+    return _FakeToolCallingLLM()
 
 
 # ============================================================================
@@ -145,11 +157,7 @@ def mock_llm_with_tools():
 @pytest.fixture
 def sample_user_intent():
     """Create a sample UserIntent."""
-    return UserIntent(
-        intent_type="qa",
-        confidence=0.9,
-        reasoning="User is asking a question about the documents"
-    )
+    return _SAMPLE_USER_INTENT
 
 
 @pytest.fixture
@@ -209,110 +217,127 @@ def sample_document():
 # ============================================================================
 # State Fixtures
 # ============================================================================
+#
+# The state dicts are built once as module-level templates; the fixtures
+# hand each test a shallow dict copy, so the per-test cost is one dict
+# construction instead of rebuilding the full literal (and its nested
+# UserIntent) every time. Nodes return state updates rather than mutating
+# in place, so sharing the nested values is safe.
+
+_SAMPLE_USER_INTENT = UserIntent(
+    intent_type="qa",
+    confidence=0.9,
+    reasoning="User is asking a question about the documents"
+)
+
+_BASE_STATE = dict(
+    user_input="",
+    messages=[],
+    intent=None,
+    next_step="classify_intent",
+    conversation_summary="",
+    active_documents=[],
+    current_response=None,
+    tools_used=[],
+    session_id="test_session",
+    user_id="test_user",
+    actions_taken=[]
+)
+
+
+def _state(**overrides):
+    """Build a read-only GraphState template from the base state plus overrides.
+
+    Templates are wrapped in MappingProxyType so an accidental write to a
+    template (rather than a fixture's copy) raises instead of silently
+    leaking into every later test.
+    """
+    return MappingProxyType(GraphState(**{**_BASE_STATE, **overrides}))
+
+
+_EMPTY_STATE_TEMPLATE = _state()
+
+_QA_STATE_TEMPLATE = _state(
+    user_input="What is the total revenue?",
+    intent=_SAMPLE_USER_INTENT,
+    next_step="qa_agent",
+)
+
+_CALCULATION_STATE_TEMPLATE = _state(
+    user_input="Calculate the total of Q1 and Q2 revenue",
+    intent=UserIntent(
+        intent_type="calculation",
+        confidence=0.95,
+        reasoning="User wants to perform a calculation"
+    ),
+    next_step="calculation_agent",
+)
+
+_SUMMARIZATION_STATE_TEMPLATE = _state(
+    user_input="Summarize the annual report",
+    intent=UserIntent(
+        intent_type="summarization",
+        confidence=0.92,
+        reasoning="User wants a summary of documents"
+    ),
+    next_step="summarization_agent",
+)
+
 
 @pytest.fixture
 def empty_graph_state():
     """Create an empty GraphState."""
-    return GraphState(
-        user_input="",
-        messages=[],
-        intent=None,
-        next_step="classify_intent",
-        conversation_summary="",
-        active_documents=[],
-        current_response=None,
-        tools_used=[],
-        session_id="test_session",
-        user_id="test_user",
-        actions_taken=[]
-    )
+    return dict(_EMPTY_STATE_TEMPLATE)
 
 
 @pytest.fixture
-def qa_graph_state(sample_user_intent):
+def qa_graph_state():
     """Create a GraphState for Q&A testing."""
-    return GraphState(
-        user_input="What is the total revenue?",
-        messages=[],
-        intent=sample_user_intent,
-        next_step="qa_agent",
-        conversation_summary="",
-        active_documents=[],
-        current_response=None,
-        tools_used=[],
-        session_id="test_session",
-        user_id="test_user",
-        actions_taken=[]
-    )
+    return dict(_QA_STATE_TEMPLATE)
 
 
 @pytest.fixture
 def calculation_graph_state():
     """Create a GraphState for calculation testing."""
-    return GraphState(
-        user_input="Calculate the total of Q1 and Q2 revenue",
-        messages=[],
-        intent=UserIntent(
-            intent_type="calculation",
-            confidence=0.95,
-            reasoning="User wants to perform a calculation"
-        ),
-        next_step="calculation_agent",
-        conversation_summary="",
-        active_documents=[],
-        current_response=None,
-        tools_used=[],
-        session_id="test_session",
-        user_id="test_user",
-        actions_taken=[]
-    )
+    return dict(_CALCULATION_STATE_TEMPLATE)
 
 
 @pytest.fixture
 def summarization_graph_state():
     """Create a GraphState for summarization testing."""
-    return GraphState(
-        user_input="Summarize the annual report",
-        messages=[],
-        intent=UserIntent(
-            intent_type="summarization",
-            confidence=0.92,
-            reasoning="User wants a summary of documents"
-        ),
-        next_step="summarization_agent",
-        conversation_summary="",
-        active_documents=[],
-        current_response=None,
-        tools_used=[],
-        session_id="test_session",
-        user_id="test_user",
-        actions_taken=[]
-    )
+    return dict(_SUMMARIZATION_STATE_TEMPLATE)
 
 
 # ============================================================================
 # Tool Fixtures
 # ============================================================================
 
-@pytest.fixture
+class _FakeTool:
+    """Tool stand-in returning a fixed result."""
+
+    __slots__ = ("name", "_result")
+
+    def __init__(self, name, result):
+        self.name = name
+        self._result = result
+
+    def invoke(self, args):
+        return self._result
+
+
+@pytest.fixture(scope="session")
 def mock_calculator_tool():
     """Create a mock calculator tool."""
-    tool = MagicMock()
-    tool.name = "calculator"
-    tool.invoke = lambda args: "42"
-    return tool
+    return _FakeTool("calculator", "42")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_document_reader_tool():
     """Create a mock document reader tool."""
-    tool = MagicMock()
-    tool.name = "read_document"
-    tool.invoke = lambda args: "Mock document content: Revenue was $1,000,000"
-    return tool
+    return _FakeTool("read_document", "Mock document content: Revenue was $1,000,000")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_tools(mock_calculator_tool, mock_document_reader_tool):
     """Create a list of mock tools."""
     return [mock_calculator_tool, mock_document_reader_tool]
@@ -322,7 +347,7 @@ def mock_tools(mock_calculator_tool, mock_document_reader_tool):
 # Configuration Fixtures
 # ============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_config(mock_llm, mock_tools):
     """Create a mock RunnableConfig."""
     return {
@@ -339,37 +364,42 @@ def mock_config(mock_llm, mock_tools):
 # Conversation History Fixtures
 # ============================================================================
 
-@pytest.fixture
+_CONVERSATION_HISTORY = [
+    {"role": "user", "content": "What is the company revenue?"},
+    {"role": "assistant", "content": "The company revenue is $1,000,000."},
+    {"role": "user", "content": "What about expenses?"},
+    {"role": "assistant", "content": "The expenses are $700,000."},
+]
+
+_HISTORY_STATE_TEMPLATE = _state(
+    user_input="What is the profit margin?",
+    messages=_CONVERSATION_HISTORY,
+    intent=UserIntent(
+        intent_type="qa",
+        confidence=0.9,
+        reasoning="Follow-up question about finances"
+    ),
+    next_step="qa_agent",
+    conversation_summary="User asking about company financials",
+    active_documents=["financial_report.txt"],
+    actions_taken=["classify_intent"]
+)
+
+
+@pytest.fixture(scope="session")
 def sample_conversation_history():
-    """Create a sample conversation history."""
-    return [
-        {"role": "user", "content": "What is the company revenue?"},
-        {"role": "assistant", "content": "The company revenue is $1,000,000."},
-        {"role": "user", "content": "What about expenses?"},
-        {"role": "assistant", "content": "The expenses are $700,000."},
-    ]
+    """Return the shared sample conversation history.
+
+    Exposed as an immutable tuple so one instance can serve the whole
+    session; tests that need a mutable copy call list() on it.
+    """
+    return tuple(_CONVERSATION_HISTORY)
 
 
 @pytest.fixture
-def graph_state_with_history(sample_conversation_history):
+def graph_state_with_history():
     """Create a GraphState with conversation history."""
-    return GraphState(
-        user_input="What is the profit margin?",
-        messages=sample_conversation_history,
-        intent=UserIntent(
-            intent_type="qa",
-            confidence=0.9,
-            reasoning="Follow-up question about finances"
-        ),
-        next_step="qa_agent",
-        conversation_summary="User asking about company financials",
-        active_documents=["financial_report.txt"],
-        current_response=None,
-        tools_used=[],
-        session_id="test_session",
-        user_id="test_user",
-        actions_taken=["classify_intent"]
-    )
+    return dict(_HISTORY_STATE_TEMPLATE)
 
 
 # ============================================================================
@@ -391,15 +421,24 @@ def pytest_configure(config):
 
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers automatically."""
+    # Path-based markers are the same for every item in a file, so scan
+    # each file path once and reuse the result for its siblings
+    path_markers = {}
     for item in items:
-        # Add 'unit' marker to tests in test_unit directory
-        if "test_unit" in str(item.fspath):
-            item.add_marker(pytest.mark.unit)
-        
-        # Add 'integration' marker to tests in test_integration directory
-        if "test_integration" in str(item.fspath):
-            item.add_marker(pytest.mark.integration)
-        
+        path = str(item.fspath)
+        markers = path_markers.get(path)
+        if markers is None:
+            markers = []
+            # 'unit' marker for tests in test_unit directory
+            if "test_unit" in path:
+                markers.append(pytest.mark.unit)
+            # 'integration' marker for tests in test_integration directory
+            if "test_integration" in path:
+                markers.append(pytest.mark.integration)
+            path_markers[path] = markers
+        for marker in markers:
+            item.add_marker(marker)
+
         # Add 'slow' marker to tests that match certain patterns
         if "slow" in item.name.lower():
             item.add_marker(pytest.mark.slow)
@@ -3,22 +3,15 @@ Simple test to verify agent logic without API calls.
 Tests the message handling and tool calling logic.
 """
 
-import sys
-from pathlib import Path
-
-# Add project root to path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+import pytest
 
 from src.agent import GraphState, UserIntent, AnswerResponse
 
+pytestmark = pytest.mark.unit
+
 
 def test_graph_state():
     """Test GraphState initialization."""
-    print("\n" + "=" * 70)
-    print("  Testing GraphState Initialization")
-    print("=" * 70)
-
     state = GraphState(
         user_input="What is the total Q1 sales revenue?",
         intent=None,
@@ -32,39 +25,24 @@ def test_graph_state():
         actions_taken=[]
     )
 
-    print(f"✅ GraphState created successfully")
-    print(f"   - user_input: {state['user_input']}")
-    print(f"   - next_step: {state['next_step']}")
     assert state['user_input'] == "What is the total Q1 sales revenue?"
     assert state['next_step'] == "classify_intent"
 
 
 def test_user_intent():
     """Test UserIntent model."""
-    print("\n" + "=" * 70)
-    print("  Testing UserIntent Model")
-    print("=" * 70)
-
     intent = UserIntent(
         intent_type="qa",
         confidence=0.95,
         reasoning="The user is asking a question about specific data"
     )
 
-    print(f"✅ UserIntent created successfully")
-    print(f"   - intent_type: {intent.intent_type}")
-    print(f"   - confidence: {intent.confidence}")
-    print(f"   - reasoning: {intent.reasoning}")
     assert intent.intent_type == "qa"
     assert intent.confidence == 0.95
 
 
 def test_answer_response():
     """Test AnswerResponse model."""
-    print("\n" + "=" * 70)
-    print("  Testing AnswerResponse Model")
-    print("=" * 70)
-
     response = AnswerResponse(
         question="What is the total Q1 sales revenue?",
         answer="Based on the Q1 2024 Sales Report, the total sales revenue was $1,250,000.",
@@ -72,109 +50,5 @@ def test_answer_response():
         confidence=0.9
     )
 
-    print(f"✅ AnswerResponse created successfully")
-    print(f"   - question: {response.question}")
-    print(f"   - answer: {response.answer[:50]}...")
-    print(f"   - sources: {response.sources}")
-    print(f"   - confidence: {response.confidence}")
     assert response.question == "What is the total Q1 sales revenue?"
     assert "document_reader" in response.sources
-
-
-def test_message_format():
-    """Test message format for OpenAI API."""
-    print("\n" + "=" * 70)
-    print("  Testing Message Format")
-    print("=" * 70)
-
-    # Test that we can create messages in the correct format
-    messages = [
-        {"role": "system", "content": "You are a helpful assistant."},
-        {"role": "user", "content": "What is the total Q1 sales revenue?"}
-    ]
-
-    print(f"✅ Messages created successfully")
-    print(f"   - Number of messages: {len(messages)}")
-    print(f"   - Message roles: {[msg['role'] for msg in messages]}")
-
-    # Verify no tool messages are present
-    tool_messages = [msg for msg in messages if msg.get("role") == "tool"]
-    assert len(tool_messages) == 0, "No tool messages should be present in initial messages"
-    print(f"   - ✅ No tool messages present")
-
-    # Verify no tool_calls are present
-    messages_with_tool_calls = [msg for msg in messages if msg.get("tool_calls")]
-    assert len(messages_with_tool_calls) == 0, "No tool_calls should be present in initial messages"
-    print(f"   - ✅ No tool_calls present")
-
-
-def test_fresh_messages_approach():
-    """Test the fresh messages approach for tool results."""
-    print("\n" + "=" * 70)
-    print("  Testing Fresh Messages Approach")
-    print("=" * 70)
-
-    # Simulate tool results
-    tool_results_text = "Tool result: Retrieved 3 document(s) containing information about Q1 sales revenue totaling $1,250,000."
-    question = "What is the total Q1 sales revenue?"
-    system_prompt = "You are a helpful assistant that answers questions based on document data."
-
-    # Create fresh messages as done in the agent code
-    fresh_messages = [
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": f"Based on this information from the documents:\n\n{tool_results_text}\n\nPlease provide a detailed answer to this question: {question}\n\nUse the specific data from the documents in your answer."}
-    ]
-
-    print(f"✅ Fresh messages created successfully")
-    print(f"   - Number of messages: {len(fresh_messages)}")
-    print(f"   - System message present: {fresh_messages[0]['role'] == 'system'}")
-    print(f"   - User message includes tool results: {'Tool result' in fresh_messages[1]['content']}")
-
-    # Verify structure
-    assert len(fresh_messages) == 2
-    assert fresh_messages[0]["role"] == "system"
-    assert fresh_messages[1]["role"] == "user"
-    assert "Tool result" in fresh_messages[1]["content"]
-    assert question in fresh_messages[1]["content"]
-    print(f"   - ✅ Message structure is correct")
-    print(f"   - ✅ No tool messages or tool_calls in fresh messages")
-
-
-def main():
-    """Run all tests."""
-    print("\n" + "=" * 70)
-    print("  Document Assistant - Agent Logic Tests")
-    print("  (No API calls required)")
-    print("=" * 70)
-
-    try:
-        test_graph_state()
-        test_user_intent()
-        test_answer_response()
-        test_message_format()
-        test_fresh_messages_approach()
-
-        print("\n" + "=" * 70)
-        print("  ✅ ALL TESTS PASSED")
-        print("=" * 70)
-        print("\n✅ Agent logic is working correctly!")
-        print("✅ Message format changes are correct!")
-        print("✅ Fresh messages approach eliminates tool message errors!")
-        print("\nNote: The code changes fix the tool message format errors by:")
-        print("  1. Using fresh message lists after tool calls")
-        print("  2. Passing tool results as user messages")
-        print("  3. Using plain LLM (not llm_with_tools) for final response")
-        print("  4. Avoiding carrying over problematic message formats")
-
-    except AssertionError as e:
-        print(f"\n❌ TEST FAILED: {e}")
-        return 1
-    except Exception as e:
-        print(f"\n❌ ERROR: {e}")
-        return 1
-
-    return 0
-
-
-if __name__ == "__main__":
-    exit(main())
@@ -4,6 +4,8 @@ Tests agent logic, routing, and state management.
 """
 
 import pytest
+from collections import ChainMap
+from types import MappingProxyType
 from unittest.mock import MagicMock, patch
 
 from src.agent import (
@@ -17,6 +19,20 @@ from src.agent import (
 from src.schemas import UserIntent, AnswerResponse, CalculationResponse, SummarizationResponse
 
 
+# Shared "no LLM configured" config; read-only so one instance can be
+# handed to every test, and accidental mutation raises instead of
+# leaking into later tests
+_EMPTY_CONFIG = MappingProxyType({"configurable": MappingProxyType({})})
+
+# Sample response reused wherever a test only needs "some response" on the
+# state; built once so each use skips pydantic validation
+_SAMPLE_ANSWER = AnswerResponse(
+    question="Test",
+    answer="Test answer",
+    confidence=0.9
+)
+
+
 # ============================================================================
 # Intent Classification Tests
 # ============================================================================
@@ -45,7 +61,7 @@ class TestClassifyIntent:
         state = empty_graph_state.copy()
         state["user_input"] = "Calculate the sum of Q1 and Q2"
         
-        config = {"configurable": {}}
+        config = _EMPTY_CONFIG
         result = classify_intent(state, config)
         
         assert result["intent"].intent_type == "calculation"
@@ -56,34 +72,33 @@ class TestClassifyIntent:
         state = empty_graph_state.copy()
         state["user_input"] = "Summarize the annual report"
         
-        config = {"configurable": {}}
+        config = _EMPTY_CONFIG
         result = classify_intent(state, config)
         
         assert result["intent"].intent_type == "summarization"
 
-    def test_classify_intent_calculation_keywords(self, empty_graph_state):
+    @pytest.mark.parametrize("user_input", [
+        "Calculate the total",
+        "What is the sum of revenues?",
+        "Average expenses",
+        "Multiply 10 by 20"
+    ])
+    def test_classify_intent_calculation_keywords(self, empty_graph_state, user_input):
         """Test classification detects calculation keywords."""
-        test_cases = [
-            "Calculate the total",
-            "What is the sum of revenues?",
-            "Average expenses",
-            "Multiply 10 by 20"
-        ]
-        
-        config = {"configurable": {}}
-        
-        for user_input in test_cases:
-            state = empty_graph_state.copy()
-            state["user_input"] = user_input
-            result = classify_intent(state, config)
-            assert result["intent"].intent_type == "calculation", f"Failed for: {user_input}"
+        state = empty_graph_state.copy()
+        state["user_input"] = user_input
+
+        config = _EMPTY_CONFIG
+        result = classify_intent(state, config)
+
+        assert result["intent"].intent_type == "calculation"
 
     def test_classify_intent_defaults_to_qa(self, empty_graph_state):
         """Test classification defaults to Q&A for unclear intents."""
         state = empty_graph_state.copy()
         state["user_input"] = "Tell me about the company"
         
-        config = {"configurable": {}}
+        config = _EMPTY_CONFIG
         result = classify_intent(state, config)
         
         assert result["intent"].intent_type == "qa"
@@ -109,7 +124,7 @@ class TestQAAgent:
 
     def test_qa_agent_without_llm(self, qa_graph_state):
         """Test Q&A agent without LLM configuration."""
-        config = {"configurable": {}}
+        config = _EMPTY_CONFIG
         result = qa_agent(qa_graph_state, config)
         
         assert result["current_response"].confidence == 0.0
@@ -170,7 +185,7 @@ class TestCalculationAgent:
 
     def test_calculation_agent_without_llm(self, calculation_graph_state):
         """Test calculation agent without LLM."""
-        config = {"configurable": {}}
+        config = _EMPTY_CONFIG
         result = calculation_agent(calculation_graph_state, config)
         
         assert isinstance(result["current_response"], CalculationResponse)
@@ -219,7 +234,7 @@ class TestSummarizationAgent:
 
     def test_summarization_agent_without_llm(self, summarization_graph_state):
         """Test summarization agent without LLM."""
-        config = {"configurable": {}}
+        config = _EMPTY_CONFIG
         result = summarization_agent(summarization_graph_state, config)
         
         assert isinstance(result["current_response"], SummarizationResponse)
@@ -247,11 +262,7 @@ class TestUpdateMemory:
 
     def test_update_memory_basic(self, qa_graph_state, mock_config):
         """Test basic memory update."""
-        qa_graph_state["current_response"] = AnswerResponse(
-            question="Test",
-            answer="Test answer",
-            confidence=0.9
-        )
+        qa_graph_state["current_response"] = _SAMPLE_ANSWER
         
         result = update_memory(qa_graph_state, mock_config)
 
@@ -262,7 +273,7 @@ class TestUpdateMemory:
 
     def test_update_memory_without_llm(self, qa_graph_state):
         """Test memory update without LLM."""
-        config = {"configurable": {}}
+        config = _EMPTY_CONFIG
         result = update_memory(qa_graph_state, config)
         
         assert "conversation_summary" in result
@@ -278,39 +289,22 @@ class TestUpdateMemory:
 class TestRouteIntent:
     """Tests for intent routing."""
 
-    def test_route_to_qa_agent(self, empty_graph_state):
-        """Test routing to Q&A agent."""
-        state = empty_graph_state.copy()
-        state["next_step"] = "qa_agent"
-        
-        result = route_intent(state)
-        assert result == "qa_agent"
-
-    def test_route_to_calculation_agent(self, empty_graph_state):
-        """Test routing to calculation agent."""
-        state = empty_graph_state.copy()
-        state["next_step"] = "calculation_agent"
-        
-        result = route_intent(state)
-        assert result == "calculation_agent"
-
-    def test_route_to_summarization_agent(self, empty_graph_state):
-        """Test routing to summarization agent."""
+    @pytest.mark.parametrize("next_step,expected", [
+        ("qa_agent", "qa_agent"),
+        ("calculation_agent", "calculation_agent"),
+        ("summarization_agent", "summarization_agent"),
+        (None, "qa_agent"),  # missing next_step falls back to qa_agent
+    ], ids=["qa", "calculation", "summarization", "default"])
+    def test_route_intent(self, empty_graph_state, next_step, expected):
+        """Test routing for each agent plus the default fallback."""
         state = empty_graph_state.copy()
-        state["next_step"] = "summarization_agent"
-        
-        result = route_intent(state)
-        assert result == "summarization_agent"
-
-    def test_route_default(self, empty_graph_state):
-        """Test default routing when next_step not set."""
-        state = empty_graph_state.copy()
-        # Remove next_step to test default behavior
-        if "next_step" in state:
-            del state["next_step"]
+        if next_step is None:
+            state.pop("next_step", None)
+        else:
+            state["next_step"] = next_step
 
         result = route_intent(state)
-        assert result == "qa_agent"
+        assert result == expected
 
 
 # ============================================================================
@@ -322,62 +316,29 @@ class TestRouteIntent:
 class TestAgentIntegration:
     """Integration tests for agent workflow."""
 
-    def test_full_qa_workflow(self, empty_graph_state, mock_config):
-        """Test complete Q&A workflow from classification to memory."""
+    @pytest.mark.parametrize("user_input,agent_fn,response_type", [
+        ("What is the revenue?", qa_agent, AnswerResponse),
+        ("Calculate the sum of 10 and 20", calculation_agent, CalculationResponse),
+        ("Summarize the document", summarization_agent, SummarizationResponse),
+    ])
+    def test_full_workflow(self, empty_graph_state, mock_config,
+                           user_input, agent_fn, response_type):
+        """Test the complete workflow from classification to memory."""
+        # Each stage's update is layered onto the state as a ChainMap
+        # child instead of rewriting the base dict, mirroring how the
+        # graph merges node deltas
         # Step 1: Classify intent
-        state = empty_graph_state.copy()
-        state["user_input"] = "What is the revenue?"
-        result = classify_intent(state, mock_config)
-        state.update(result)  # Merge updates into state
+        state = ChainMap({"user_input": user_input}, empty_graph_state)
+        state = state.new_child(classify_intent(state, mock_config))
 
         # Step 2: Route to appropriate agent
         next_node = route_intent(state)
         assert next_node in ["qa_agent", "calculation_agent", "summarization_agent"]
 
         # Step 3: Execute agent
-        result = qa_agent(state, mock_config)
-        state.update(result)  # Merge updates into state
-        assert "current_response" in state
+        state = state.new_child(agent_fn(state, mock_config))
+        assert isinstance(state["current_response"], response_type)
 
         # Step 4: Update memory
-        result = update_memory(state, mock_config)
-        state.update(result)  # Merge updates into state
-        assert state["next_step"] == "__end__"
-
-    def test_calculation_workflow(self, empty_graph_state, mock_config):
-        """Test complete calculation workflow."""
-        state = empty_graph_state.copy()
-        state["user_input"] = "Calculate the sum of 10 and 20"
-
-        # Classify
-        result = classify_intent(state, mock_config)
-        state.update(result)  # Merge updates into state
-
-        # Execute calculation agent
-        result = calculation_agent(state, mock_config)
-        state.update(result)  # Merge updates into state
-        assert isinstance(state["current_response"], CalculationResponse)
-
-        # Update memory
-        result = update_memory(state, mock_config)
-        state.update(result)  # Merge updates into state
-        assert state["next_step"] == "__end__"
-
-    def test_summarization_workflow(self, empty_graph_state, mock_config):
-        """Test complete summarization workflow."""
-        state = empty_graph_state.copy()
-        state["user_input"] = "Summarize the document"
-
-        # Classify
-        result = classify_intent(state, mock_config)
-        state.update(result)  # Merge updates into state
-
-        # Execute summarization agent
-        result = summarization_agent(state, mock_config)
-        state.update(result)  # Merge updates into state
-        assert isinstance(state["current_response"], SummarizationResponse)
-
-        # Update memory
-        result = update_memory(state, mock_config)
-        state.update(result)  # Merge updates into state
+        state = state.new_child(update_memory(state, mock_config))
         assert state["next_step"] == "__end__"
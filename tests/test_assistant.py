@@ -1,19 +1,18 @@
 """Test script for the Document Assistant with Vocareum."""
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from src.assistant import DocumentAssistant
 from src.config import get_default_llm
 
+_EQ = "=" * 70
+_DASH = "-" * 70
 
-def create_sample_documents():
-    """Create sample documents for testing."""
-    docs_dir = Path("documents")
-    docs_dir.mkdir(exist_ok=True)
 
-    # Sales data document
-    sales_doc = docs_dir / "sales_data.txt"
-    sales_doc.write_text("""Q1 2024 Sales Report
+# Sample corpus written out by create_sample_documents
+SAMPLE_DOCUMENTS = {
+    "sales_data.txt": """Q1 2024 Sales Report
 
 January Sales: $50,000
 February Sales: $60,000
@@ -26,11 +25,8 @@ Key Findings:
 - March showed the highest revenue
 - Customer acquisition grew by 15%
 - Average customer value: $250
-""")
-
-    # Team information document
-    team_doc = docs_dir / "team_info.txt"
-    team_doc.write_text("""Team Information
+""",
+    "team_info.txt": """Team Information
 
 Team Members:
 - Alice Johnson (Manager)
@@ -44,7 +40,20 @@ Projects:
 3. Data Analytics Dashboard - Budget: $20,000
 
 Total Project Budget: $100,000
-""")
+""",
+}
+
+
+def create_sample_documents():
+    """Create sample documents for testing."""
+    docs_dir = Path("documents")
+    docs_dir.mkdir(exist_ok=True)
+
+    # Writes are independent and I/O-bound, so overlap them on a thread
+    # pool (same pattern as DocumentRetriever's parallel loads)
+    with ThreadPoolExecutor(max_workers=len(SAMPLE_DOCUMENTS)) as executor:
+        for name, content in SAMPLE_DOCUMENTS.items():
+            executor.submit((docs_dir / name).write_text, content)
 
     print(f"Created sample documents in {docs_dir}/")
     return str(docs_dir)
@@ -52,10 +61,7 @@ Total Project Budget: $100,000
 
 def test_assistant():
     """Test the Document Assistant functionality."""
-    print("=" * 70)
-    print("Document Assistant - Vocareum Test Suite")
-    print("=" * 70)
-    print()
+    print(f"{_EQ}\nDocument Assistant - Vocareum Test Suite\n{_EQ}\n")
 
     # Create sample documents
     print("Step 1: Creating sample documents...")
@@ -88,9 +94,7 @@ def test_assistant():
     print(f"✓ Loaded {count} documents\n")
 
     # Test Q&A Intent
-    print("=" * 70)
-    print("TEST 1: Q&A Intent (Information Retrieval)")
-    print("=" * 70)
+    print(f"{_EQ}\nTEST 1: Q&A Intent (Information Retrieval)\n{_EQ}")
     test_queries = [
         "What was the total Q1 sales?",
         "Who is the team manager?",
@@ -98,16 +102,12 @@ def test_assistant():
     ]
 
     for query in test_queries:
-        print(f"\nQ: {query}")
-        print("Processing...")
+        print(f"\nQ: {query}\nProcessing...")
         response = assistant.query(query)
-        print(f"A: {response}")
-        print("-" * 70)
+        print(f"A: {response}\n{_DASH}")
 
     # Test Calculation Intent
-    print("\n" + "=" * 70)
-    print("TEST 2: Calculation Intent (Mathematical Operations)")
-    print("=" * 70)
+    print(f"\n{_EQ}\nTEST 2: Calculation Intent (Mathematical Operations)\n{_EQ}")
     calc_queries = [
         "Calculate the average monthly sales for Q1",
         "What's the sum of January and February sales?",
@@ -115,16 +115,12 @@ def test_assistant():
     ]
 
     for query in calc_queries:
-        print(f"\nQ: {query}")
-        print("Processing...")
+        print(f"\nQ: {query}\nProcessing...")
         response = assistant.query(query)
-        print(f"A: {response}")
-        print("-" * 70)
+        print(f"A: {response}\n{_DASH}")
 
     # Test Summarization Intent
-    print("\n" + "=" * 70)
-    print("TEST 3: Summarization Intent (Summary Generation)")
-    print("=" * 70)
+    print(f"\n{_EQ}\nTEST 3: Summarization Intent (Summary Generation)\n{_EQ}")
     summary_queries = [
         "Summarize the sales report",
         "Give me an overview of the team information",
@@ -132,32 +128,22 @@ def test_assistant():
     ]
 
     for query in summary_queries:
-        print(f"\nQ: {query}")
-        print("Processing...")
+        print(f"\nQ: {query}\nProcessing...")
         response = assistant.query(query)
-        print(f"A: {response}")
-        print("-" * 70)
+        print(f"A: {response}\n{_DASH}")
 
     # Test Conversation Context
-    print("\n" + "=" * 70)
-    print("TEST 4: Conversation Context (Memory)")
-    print("=" * 70)
-    print("\nQ: What was the March sales figure?")
-    print("Processing...")
+    print(f"\n{_EQ}\nTEST 4: Conversation Context (Memory)\n{_EQ}")
+    print("\nQ: What was the March sales figure?\nProcessing...")
     response1 = assistant.query("What was the March sales figure?")
-    print(f"A: {response1}")
-    print("-" * 70)
+    print(f"A: {response1}\n{_DASH}")
 
-    print("\nQ: How does that compare to January?")
-    print("Processing...")
+    print("\nQ: How does that compare to January?\nProcessing...")
     response2 = assistant.query("How does that compare to January?")
-    print(f"A: {response2}")
-    print("-" * 70)
+    print(f"A: {response2}\n{_DASH}")
 
     # Print statistics
-    print("\n" + "=" * 70)
-    print("STATISTICS")
-    print("=" * 70)
+    print(f"\n{_EQ}\nSTATISTICS\n{_EQ}")
     stats = assistant.get_stats()
     print(f"Documents loaded: {stats['num_documents']}")
     print(f"Total sessions: {stats['num_sessions']}")
@@ -173,9 +159,7 @@ def test_assistant():
         print("✗ Failed to save session")
     print()
 
-    print("=" * 70)
-    print("Test Suite Complete!")
-    print("=" * 70)
+    print(f"{_EQ}\nTest Suite Complete!\n{_EQ}")
     print("\nNext steps:")
     print("1. Review the responses above")
     print("2. Check the 'sessions/' directory for saved session data")
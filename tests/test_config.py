@@ -5,27 +5,51 @@ Tests the configuration without making actual API calls.
 
 import sys
 import os
+
+import pytest
 from pathlib import Path
 
 # Add project root to path
-project_root = Path(__file__).parent.parent
+project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
 
+# Resolved once at import: the .env file does not appear or vanish
+# mid-run, so main() reads this instead of re-statting the path
+_ENV_FILE = project_root / ".env"
+_ENV_FILE_EXISTS = _ENV_FILE.is_file()
+
 from src.config import get_openai_client
 
+_EQ = "=" * 70
+_DASH = "─" * 70
+
+# Environment snapshot taken once at import: these values don't change
+# after process start, so the tests read this dict instead of paying an
+# os.getenv call (env lock + copy) per lookup
+_ENV = {
+    key: os.environ.get(key)
+    for key in (
+        "API_PROVIDER",
+        "OPENAI_BASE_URL",
+        "OPENAI_API_KEY",
+        "DEFAULT_MODEL",
+        "DEFAULT_TEMPERATURE",
+    )
+}
+
 
 def test_api_provider_detection():
     """Test that API_PROVIDER environment variable is detected correctly."""
-    print("\n" + "=" * 70)
+    print("\n" + _EQ)
     print("  Testing API Provider Detection")
-    print("=" * 70)
+    print(_EQ)
 
     # Get current provider
-    api_provider = os.getenv("API_PROVIDER", "vocareum")
+    api_provider = _ENV.get("API_PROVIDER") or "vocareum"
     print(f"\n📋 Current API_PROVIDER: {api_provider}")
 
     # Get base URL setting
-    base_url = os.getenv("OPENAI_BASE_URL", "")
+    base_url = _ENV.get("OPENAI_BASE_URL") or ""
     if base_url:
         print(f"🔗 OPENAI_BASE_URL: {base_url}")
     else:
@@ -37,41 +61,40 @@ def test_api_provider_detection():
 
 def test_openai_client_initialization():
     """Test that OpenAI client can be initialized with current config."""
-    print("\n" + "=" * 70)
-    print("  Testing OpenAI Client Initialization")
-    print("=" * 70)
+    # Skip before touching the factory: without a key the client cannot
+    # be built, so there is nothing to construct or catch
+    if not _ENV.get("OPENAI_API_KEY"):
+        pytest.skip("OPENAI_API_KEY not set")
 
-    try:
-        # This should work with either openai or vocareum provider
-        llm = get_openai_client()
+    print("\n" + _EQ)
+    print("  Testing OpenAI Client Initialization")
+    print(_EQ)
 
-        print(f"\n✅ ChatOpenAI client created successfully")
-        print(f"   - Model: {llm.model_name}")
-        print(f"   - Temperature: {llm.temperature}")
+    # This should work with either openai or vocareum provider
+    llm = get_openai_client()
 
-        # Check if base_url is set (indicates Vocareum)
-        if hasattr(llm, 'openai_api_base') and llm.openai_api_base:
-            print(f"   - Base URL: {llm.openai_api_base}")
-            print(f"   - Provider: Vocareum (custom endpoint)")
-        else:
-            print(f"   - Base URL: (default OpenAI)")
-            print(f"   - Provider: OpenAI (direct)")
+    print(f"\n✅ ChatOpenAI client created successfully")
+    print(f"   - Model: {llm.model_name}")
+    print(f"   - Temperature: {llm.temperature}")
 
-    except ValueError as e:
-        print(f"\n❌ ERROR: {e}")
-        print(f"\nThis is expected if OPENAI_API_KEY is not set in .env")
-        return False
+    # Check if base_url is set (indicates Vocareum)
+    if hasattr(llm, 'openai_api_base') and llm.openai_api_base:
+        print(f"   - Base URL: {llm.openai_api_base}")
+        print(f"   - Provider: Vocareum (custom endpoint)")
+    else:
+        print(f"   - Base URL: (default OpenAI)")
+        print(f"   - Provider: OpenAI (direct)")
 
     return True
 
 
 def test_provider_switching():
     """Test configuration behavior with different provider settings."""
-    print("\n" + "=" * 70)
+    print("\n" + _EQ)
     print("  Testing Provider Switching Logic")
-    print("=" * 70)
+    print(_EQ)
 
-    api_provider = os.getenv("API_PROVIDER", "vocareum")
+    api_provider = _ENV.get("API_PROVIDER") or "vocareum"
 
     print(f"\n🔄 Current configuration:")
     print(f"   - API_PROVIDER = '{api_provider}'")
@@ -84,7 +107,7 @@ def test_provider_switching():
         print(f"   - No budget limitations (paid usage)")
 
     elif api_provider == "vocareum":
-        base_url = os.getenv("OPENAI_BASE_URL", "https://openai.vocareum.com/v1")
+        base_url = _ENV.get("OPENAI_BASE_URL") or "https://openai.vocareum.com/v1"
         print(f"\n✅ Configured for Vocareum endpoint")
         print(f"   Expected behavior:")
         print(f"   - Will use {base_url}")
@@ -96,27 +119,31 @@ def test_provider_switching():
     print(f"   For Vocareum: API_PROVIDER=vocareum")
 
 
+# Variable tables hoisted out of test_configuration_completeness: the
+# (name, description) pairs are fixed, so the immutable tuples are built
+# once at import instead of as dict literals per call
+_REQUIRED_VARS = (
+    ('OPENAI_API_KEY', 'API key for authentication'),
+    ('API_PROVIDER', 'API provider selection (openai/vocareum)'),
+)
+
+_OPTIONAL_VARS = (
+    ('OPENAI_BASE_URL', 'Custom endpoint URL (for Vocareum)'),
+    ('DEFAULT_MODEL', 'Default model to use'),
+    ('DEFAULT_TEMPERATURE', 'Default temperature setting'),
+)
+
+
 def test_configuration_completeness():
     """Check that all required configuration is present."""
-    print("\n" + "=" * 70)
+    print("\n" + _EQ)
     print("  Testing Configuration Completeness")
-    print("=" * 70)
-
-    required_vars = {
-        'OPENAI_API_KEY': 'API key for authentication',
-        'API_PROVIDER': 'API provider selection (openai/vocareum)'
-    }
-
-    optional_vars = {
-        'OPENAI_BASE_URL': 'Custom endpoint URL (for Vocareum)',
-        'DEFAULT_MODEL': 'Default model to use',
-        'DEFAULT_TEMPERATURE': 'Default temperature setting'
-    }
+    print(_EQ)
 
     print(f"\n📋 Required variables:")
     all_required_present = True
-    for var, description in required_vars.items():
-        value = os.getenv(var)
+    for var, description in _REQUIRED_VARS:
+        value = _ENV.get(var)
         if value:
             # Don't print the full API key for security
             if 'KEY' in var:
@@ -129,8 +156,8 @@ def test_configuration_completeness():
             all_required_present = False
 
     print(f"\n📋 Optional variables:")
-    for var, description in optional_vars.items():
-        value = os.getenv(var)
+    for var, description in _OPTIONAL_VARS:
+        value = _ENV.get(var)
         if value:
             print(f"   ✅ {var} = {value}")
         else:
@@ -147,37 +174,40 @@ def test_configuration_completeness():
 
 def main():
     """Run all configuration tests."""
-    print("\n" + "=" * 70)
+    print("\n" + _EQ)
     print("  Document Assistant - Configuration Tests")
     print("  (No API calls - just configuration validation)")
-    print("=" * 70)
+    print(_EQ)
 
     try:
         # Test 1: Check .env file exists
-        env_file = project_root / ".env"
-        if not env_file.exists():
+        if not _ENV_FILE_EXISTS:
             print(f"\n⚠️  WARNING: .env file not found")
-            print(f"   Expected location: {env_file}")
+            print(f"   Expected location: {_ENV_FILE}")
             print(f"   Copy .env.example to .env and add your API key")
             print(f"\n   Command: cp .env.example .env")
             return 1
 
-        print(f"\n✅ .env file found at: {env_file}")
+        print(f"\n✅ .env file found at: {_ENV_FILE}")
 
         # Run tests
         test_configuration_completeness()
         test_api_provider_detection()
         test_provider_switching()
 
-        # This test will fail if API key is not set
-        client_initialized = test_openai_client_initialization()
+        # Only attempt client construction when a key is configured
+        if _ENV.get("OPENAI_API_KEY"):
+            client_initialized = test_openai_client_initialization()
+        else:
+            print("\n⚠️  OPENAI_API_KEY not set - skipping client initialization")
+            client_initialized = False
 
-        print("\n" + "=" * 70)
+        print("\n" + _EQ)
         if client_initialized:
             print("  ✅ ALL CONFIGURATION TESTS PASSED")
         else:
             print("  ⚠️  CONFIGURATION TESTS COMPLETED WITH WARNINGS")
-        print("=" * 70)
+        print(_EQ)
 
         print(f"\n💡 Configuration Tips:")
         print(f"   - Use API_PROVIDER=openai for personal OpenAI API key")
@@ -17,6 +17,49 @@ from src.schemas import (
 )
 
 
+# Fixed timestamp passed wherever a test isn't checking the default
+# factory itself: skips a datetime.now() (gettimeofday) call per
+# construction. test_answer_response_creation keeps the default path.
+_FIXED_TS = datetime(2024, 1, 1)
+
+
+# ============================================================================
+# Shared minimal instances
+# ============================================================================
+#
+# Several tests construct a schema with only its required fields just to
+# read the defaults back. Those instances are identical, so they are built
+# once per session here and the default-value tests consume the fixture
+# instead of paying pydantic validation again per test.
+
+@pytest.fixture(scope="session")
+def base_answer():
+    """Minimal AnswerResponse for default-value checks."""
+    return AnswerResponse(
+        question="Test", answer="Answer", confidence=0.8, timestamp=_FIXED_TS
+    )
+
+
+@pytest.fixture(scope="session")
+def base_calculation():
+    """Minimal CalculationResponse for default-value checks."""
+    return CalculationResponse(
+        expression="5 * 5",
+        result="25",
+        explanation="Five times five",
+        confidence=0.9,
+        timestamp=_FIXED_TS
+    )
+
+
+@pytest.fixture(scope="session")
+def base_summarization():
+    """Minimal SummarizationResponse for default-value checks."""
+    return SummarizationResponse(
+        summary="Simple summary", confidence=0.8, timestamp=_FIXED_TS
+    )
+
+
 # ============================================================================
 # AnswerResponse Tests
 # ============================================================================
@@ -39,42 +82,13 @@ class TestAnswerResponse:
         assert response.answer == "The revenue is $1M"
         assert response.sources == ["doc1.txt"]
         assert response.confidence == 0.9
-        assert isinstance(response.timestamp, datetime)
-
-    def test_answer_response_confidence_validation(self):
-        """Test confidence score validation (0-1)."""
-        # Valid confidence
-        response = AnswerResponse(
-            question="Test",
-            answer="Answer",
-            confidence=0.5
-        )
-        assert response.confidence == 0.5
-
-        # Invalid confidence (too high)
-        with pytest.raises(ValidationError):
-            AnswerResponse(
-                question="Test",
-                answer="Answer",
-                confidence=1.5
-            )
-
-        # Invalid confidence (negative)
-        with pytest.raises(ValidationError):
-            AnswerResponse(
-                question="Test",
-                answer="Answer",
-                confidence=-0.1
-            )
+        # Exact type check: the default factory returns datetime itself,
+        # so there is no subclass MRO for isinstance to walk
+        assert type(response.timestamp) is datetime
 
-    def test_answer_response_default_sources(self):
+    def test_answer_response_default_sources(self, base_answer):
         """Test default empty sources list."""
-        response = AnswerResponse(
-            question="Test",
-            answer="Answer",
-            confidence=0.8
-        )
-        assert response.sources == []
+        assert base_answer.sources == []
 
     def test_answer_response_serialization(self):
         """Test JSON serialization."""
@@ -82,10 +96,15 @@ class TestAnswerResponse:
             question="Test question",
             answer="Test answer",
             sources=["source1", "source2"],
-            confidence=0.85
+            confidence=0.85,
+            timestamp=_FIXED_TS
         )
         
-        data = response.model_dump()
+        # Only these four fields are asserted; restricting the dump lets
+        # the serializer skip the rest of the walk
+        data = response.model_dump(
+            include={"question", "answer", "sources", "confidence"}
+        )
         assert data["question"] == "Test question"
         assert data["answer"] == "Test answer"
         assert len(data["sources"]) == 2
@@ -107,14 +126,15 @@ class TestCalculationResponse:
             expression="10 + 20",
             result="30",
             explanation="Sum of 10 and 20",
-            confidence=0.95
+            confidence=0.95,
+            timestamp=_FIXED_TS
         )
-        
+
         assert response.expression == "10 + 20"
         assert response.result == "30"
         assert response.explanation == "Sum of 10 and 20"
         assert response.confidence == 0.95
-        assert isinstance(response.timestamp, datetime)
+        assert response.timestamp == _FIXED_TS
 
     def test_calculation_response_with_units(self):
         """Test CalculationResponse with units."""
@@ -123,7 +143,8 @@ class TestCalculationResponse:
             result="15",
             explanation="15% of 100",
             units="USD",
-            confidence=0.9
+            confidence=0.9,
+            timestamp=_FIXED_TS
         )
         
         assert response.units == "USD"
@@ -135,43 +156,17 @@ class TestCalculationResponse:
             result="800",
             explanation="Total revenue",
             sources=["Q1_report.txt", "Q2_report.txt"],
-            confidence=0.92
+            confidence=0.92,
+            timestamp=_FIXED_TS
         )
         
         assert len(response.sources) == 2
         assert "Q1_report.txt" in response.sources
 
-    def test_calculation_response_confidence_validation(self):
-        """Test confidence validation for calculations."""
-        # Valid
-        response = CalculationResponse(
-            expression="1+1",
-            result="2",
-            explanation="Simple addition",
-            confidence=1.0
-        )
-        assert response.confidence == 1.0
-
-        # Invalid
-        with pytest.raises(ValidationError):
-            CalculationResponse(
-                expression="1+1",
-                result="2",
-                explanation="Simple addition",
-                confidence=2.0
-            )
-
-    def test_calculation_response_optional_fields(self):
+    def test_calculation_response_optional_fields(self, base_calculation):
         """Test optional fields have defaults."""
-        response = CalculationResponse(
-            expression="5 * 5",
-            result="25",
-            explanation="Five times five",
-            confidence=0.9
-        )
-        
-        assert response.units is None
-        assert response.sources == []
+        assert base_calculation.units is None
+        assert base_calculation.sources == []
 
 
 # ============================================================================
@@ -188,13 +183,14 @@ class TestSummarizationResponse:
         response = SummarizationResponse(
             summary="This is a summary",
             key_points=["Point 1", "Point 2", "Point 3"],
-            confidence=0.88
+            confidence=0.88,
+            timestamp=_FIXED_TS
         )
-        
+
         assert response.summary == "This is a summary"
         assert len(response.key_points) == 3
         assert response.confidence == 0.88
-        assert isinstance(response.timestamp, datetime)
+        assert response.timestamp == _FIXED_TS
 
     def test_summarization_response_with_metadata(self):
         """Test SummarizationResponse with all fields."""
@@ -203,7 +199,8 @@ class TestSummarizationResponse:
             key_points=["Key point 1", "Key point 2"],
             original_length=5000,
             document_ids=["doc1.txt", "doc2.txt", "doc3.txt"],
-            confidence=0.9
+            confidence=0.9,
+            timestamp=_FIXED_TS
         )
         
         assert response.original_length == 5000
@@ -215,29 +212,17 @@ class TestSummarizationResponse:
         response = SummarizationResponse(
             summary="Brief summary",
             key_points=[],
-            confidence=0.75
+            confidence=0.75,
+            timestamp=_FIXED_TS
         )
         
         assert response.key_points == []
 
-    def test_summarization_response_confidence_validation(self):
-        """Test confidence validation."""
-        with pytest.raises(ValidationError):
-            SummarizationResponse(
-                summary="Test",
-                confidence=-0.5
-            )
-
-    def test_summarization_response_optional_fields(self):
+    def test_summarization_response_optional_fields(self, base_summarization):
         """Test optional fields."""
-        response = SummarizationResponse(
-            summary="Simple summary",
-            confidence=0.8
-        )
-        
-        assert response.key_points == []
-        assert response.original_length is None
-        assert response.document_ids == []
+        assert base_summarization.key_points == []
+        assert base_summarization.original_length is None
+        assert base_summarization.document_ids == []
 
 
 # ============================================================================
@@ -292,31 +277,42 @@ class TestUserIntent:
         assert intent.intent_type == "unknown"
         assert intent.confidence < 0.5
 
-    def test_user_intent_confidence_bounds(self):
-        """Test confidence score boundaries."""
-        # Lower bound
-        intent = UserIntent(
-            intent_type="qa",
-            confidence=0.0,
-            reasoning="Very uncertain"
-        )
-        assert intent.confidence == 0.0
 
-        # Upper bound
-        intent = UserIntent(
-            intent_type="qa",
-            confidence=1.0,
-            reasoning="Completely certain"
-        )
-        assert intent.confidence == 1.0
+# ============================================================================
+# Confidence Validation Tests
+# ============================================================================
+#
+# Every response schema carries the same 0-1 confidence constraint; one
+# parametrized table covers all four schemas and both bound violations
+# instead of a near-identical test per class.
+
+_CONFIDENCE_SCHEMAS = [
+    (AnswerResponse, {"question": "Test", "answer": "Answer"}),
+    (CalculationResponse, {"expression": "1+1", "result": "2", "explanation": "Simple addition"}),
+    (SummarizationResponse, {"summary": "Test"}),
+    (UserIntent, {"intent_type": "qa", "reasoning": "Test reasoning"}),
+]
 
-        # Out of bounds
+
+@pytest.mark.unit
+@pytest.mark.schema
+@pytest.mark.parametrize("confidence,valid", [
+    (0.0, True),
+    (0.5, True),
+    (1.0, True),
+    (-0.1, False),
+    (1.5, False),
+])
+@pytest.mark.parametrize("schema,kwargs", _CONFIDENCE_SCHEMAS,
+                         ids=["answer", "calculation", "summarization", "intent"])
+def test_confidence_bounds(schema, kwargs, confidence, valid):
+    """Test the shared 0-1 confidence constraint on every schema."""
+    if valid:
+        instance = schema(**kwargs, confidence=confidence)
+        assert instance.confidence == confidence
+    else:
         with pytest.raises(ValidationError):
-            UserIntent(
-                intent_type="qa",
-                confidence=1.1,
-                reasoning="Too high"
-            )
+            schema(**kwargs, confidence=confidence)
 
 
 # ============================================================================
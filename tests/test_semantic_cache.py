@@ -0,0 +1,122 @@
+"""
+Unit tests for the semantic response cache.
+Tests similarity matching, namespacing, TTL expiry, and graph integration.
+"""
+
+import pytest
+
+from src.agent import check_cache
+from src.schemas import AnswerResponse
+from src.semantic_cache import SemanticCache
+
+
+@pytest.mark.unit
+class TestSemanticCache:
+    """Tests for SemanticCache behavior."""
+
+    def test_exact_match_hit(self):
+        """Test that an identical query hits the cache."""
+        cache = SemanticCache()
+        response = AnswerResponse(question="q", answer="a", confidence=0.9)
+
+        cache.store("what is the total revenue", response)
+        result = cache.check("what is the total revenue")
+
+        assert result is response
+
+    def test_near_duplicate_hit(self):
+        """Test that a near-duplicate query hits the cache."""
+        cache = SemanticCache()
+        response = AnswerResponse(question="q", answer="a", confidence=0.9)
+
+        cache.store("what is the total revenue for 2023", response)
+        result = cache.check("what is the total revenue for 2023?", threshold=0.8)
+
+        assert result is response
+
+    def test_unrelated_query_miss(self):
+        """Test that an unrelated query misses the cache."""
+        cache = SemanticCache()
+        response = AnswerResponse(question="q", answer="a", confidence=0.9)
+
+        cache.store("what is the total revenue", response)
+        result = cache.check("summarize the employee handbook")
+
+        assert result is None
+
+    def test_namespace_isolation(self):
+        """Test that entries are isolated per session/user namespace."""
+        cache = SemanticCache()
+        response = AnswerResponse(question="q", answer="a", confidence=0.9)
+
+        cache.store("what is the revenue", response, session_id="s1", user_id="u1")
+
+        assert cache.check("what is the revenue", session_id="s1", user_id="u1") is response
+        assert cache.check("what is the revenue", session_id="s2", user_id="u1") is None
+
+    def test_ttl_expiry(self):
+        """Test that entries expire after the TTL."""
+        cache = SemanticCache(ttl_seconds=0.0)
+        response = AnswerResponse(question="q", answer="a", confidence=0.9)
+
+        cache.store("what is the revenue", response)
+
+        assert cache.check("what is the revenue") is None
+
+    def test_max_entries_eviction(self):
+        """Test that the oldest entries are evicted beyond the cap."""
+        cache = SemanticCache(max_entries=2)
+        for i in range(3):
+            cache.store(f"unique query number {i}", f"response {i}")
+
+        assert cache.check(f"unique query number 0") is None
+        assert cache.check(f"unique query number 2") == "response 2"
+
+    def test_clear(self):
+        """Test clearing the cache."""
+        cache = SemanticCache()
+        cache.store("what is the revenue", "response")
+        cache.clear()
+
+        assert cache.check("what is the revenue") is None
+
+
+@pytest.mark.unit
+@pytest.mark.agent
+class TestCheckCacheNode:
+    """Tests for the check_cache graph node."""
+
+    def test_miss_routes_to_classify_intent(self, empty_graph_state):
+        """Test that a cache miss falls through to intent classification."""
+        state = empty_graph_state.copy()
+        state["user_input"] = "What is the revenue?"
+
+        config = {"configurable": {"response_cache": SemanticCache()}}
+        result = check_cache(state, config)
+
+        assert result["next_step"] == "classify_intent"
+        assert "check_cache" in result["actions_taken"]
+
+    def test_hit_routes_to_update_memory(self, empty_graph_state):
+        """Test that a cache hit skips directly to memory update."""
+        cache = SemanticCache()
+        response = AnswerResponse(question="q", answer="cached", confidence=0.9)
+        cache.store("What is the revenue?", response, session_id="test_session", user_id="test_user")
+
+        state = empty_graph_state.copy()
+        state["user_input"] = "What is the revenue?"
+
+        config = {"configurable": {"response_cache": cache}}
+        result = check_cache(state, config)
+
+        assert result["next_step"] == "update_memory"
+        assert result["current_response"] is response
+
+    def test_no_cache_configured(self, empty_graph_state):
+        """Test that the node falls through when no cache is configured."""
+        state = empty_graph_state.copy()
+        state["user_input"] = "What is the revenue?"
+
+        result = check_cache(state, {"configurable": {}})
+
+        assert result["next_step"] == "classify_intent"
@@ -3,6 +3,7 @@ Test script using sample data from data/ directory.
 This script demonstrates all Document Assistant features with real data.
 """
 
+import os
 import sys
 from pathlib import Path
 
@@ -10,76 +11,67 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.assistant import DocumentAssistant
-from src.config import get_default_llm
+_EQ = "=" * 70
+_DASH = "─" * 70
 
 
 def print_section(title):
     """Print section header."""
-    print("\n" + "=" * 70)
-    print(f"  {title}")
-    print("=" * 70)
+    # One buffered write per banner instead of three line-buffered prints
+    sys.stdout.write(f"\n{_EQ}\n  {title}\n{_EQ}\n")
 
 
 def print_subsection(title):
     """Print subsection header."""
-    print("\n" + "─" * 70)
-    print(f"{title}")
-    print("─" * 70)
+    sys.stdout.write(f"\n{_DASH}\n{title}\n{_DASH}\n")
+
+
+def run_query_batch(assistant, queries, emoji):
+    """Run independent queries through the batch path and print responses.
+
+    The queries don't depend on each other, so they go through the
+    assistant's batch path (concurrent workflow runs) instead of serial
+    network round-trips.
+    """
+    responses = assistant.batch_query(queries)
+    for i, (query, response) in enumerate(zip(queries, responses), 1):
+        print_subsection(f"Query {i}: {query}")
+        print(f"\n{emoji} Response:\n{response}")
+
+    print("\n" + _EQ)
 
 
 def test_qa_intent(assistant):
     """Test Q&A intent with information retrieval queries."""
     print_section("TEST 1: Q&A Intent - Information Retrieval")
 
-    queries = [
+    run_query_batch(assistant, [
         "What was the total Q1 sales revenue?",
         "Who is the CTO of the company?",
         "What are the top 3 products by revenue?"
-    ]
-
-    for i, query in enumerate(queries, 1):
-        print_subsection(f"Query {i}: {query}")
-        response = assistant.query(query)
-        print(f"\n💬 Response:\n{response}")
-
-    print("\n" + "=" * 70)
+    ], "💬")
 
 
 def test_calculation_intent(assistant):
     """Test calculation intent with mathematical operations."""
     print_section("TEST 2: Calculation Intent - Mathematical Operations")
 
-    queries = [
+    run_query_batch(assistant, [
         "Calculate the average monthly sales for Q1 2024",
         "What is the profit margin for Q1?",
         "Calculate the total project budget"
-    ]
-
-    for i, query in enumerate(queries, 1):
-        print_subsection(f"Query {i}: {query}")
-        response = assistant.query(query)
-        print(f"\n🧮 Response:\n{response}")
-
-    print("\n" + "=" * 70)
+    ], "🧮")
 
 
 def test_summarization_intent(assistant):
     """Test summarization intent."""
     print_section("TEST 3: Summarization Intent")
 
-    queries = [
+    run_query_batch(assistant, [
         "Summarize the Q1 sales report",
         "Give me an overview of the team structure",
         "Summarize the key financial metrics"
-    ]
-
-    for i, query in enumerate(queries, 1):
-        print_subsection(f"Query {i}: {query}")
-        response = assistant.query(query)
-        print(f"\n📝 Response:\n{response}")
-
-    print("\n" + "=" * 70)
+    ], "📝")
 
 
 def test_conversation_memory(assistant):
@@ -104,32 +96,31 @@ def test_conversation_memory(assistant):
     response3 = assistant.query(query3)
     print(f"\n💬 Response 3:\n{response3}")
 
-    print("\n" + "=" * 70)
+    print("\n" + _EQ)
 
 
-def test_session_statistics(assistant):
+def test_session_statistics(assistant, stats):
     """Test session statistics and history."""
     print_section("TEST 5: Session Statistics")
 
-    stats = assistant.get_stats()
-
     print("\n📊 Current Session Statistics:")
-    print("─" * 70)
+    print(_DASH)
     print(f"Session ID: {stats['current_session_id']}")
     print(f"Documents Loaded: {stats['num_documents']}")
     print(f"Total Sessions: {stats['num_sessions']}")
     print(f"Messages in Current Session: {stats['current_session_messages']}")
 
     print("\n📜 Conversation History (last 6 messages):")
-    print("─" * 70)
+    print(_DASH)
     history = assistant.get_session_history()
     for i, msg in enumerate(history[-6:], 1):
         role = msg.get('role', 'unknown')
         content = msg.get('content', '')
-        print(f"\n{i}. [{role.upper()}]")
-        print(f"   {content[:150]}{'...' if len(content) > 150 else ''}")
+        preview = content[:150]
+        suffix = "..." if len(content) > 150 else ""
+        print(f"\n{i}. [{role.upper()}]\n   {preview}{suffix}")
 
-    print("\n" + "=" * 70)
+    print("\n" + _EQ)
 
 
 def test_document_search(assistant):
@@ -142,19 +133,21 @@ def test_document_search(assistant):
         "profit margin"
     ]
 
-    for i, search_query in enumerate(search_queries, 1):
-        print_subsection(f"Search {i}: '{search_query}'")
+    # Resolve every search before printing: the retrieval pass stays
+    # together (warm index and cache), the I/O pass stays together
+    docs_list = [assistant.retriever.retrieve_text(q) for q in search_queries]
 
-        docs = assistant.retriever.get_relevant_documents(search_query)
+    for i, (search_query, docs) in enumerate(zip(search_queries, docs_list), 1):
+        print_subsection(f"Search {i}: '{search_query}'")
 
         print(f"\n📄 Found {len(docs)} relevant documents:")
         for j, doc in enumerate(docs[:3], 1):  # Show top 3
-            source = doc.metadata.get('source', 'unknown')
-            content = doc.page_content[:200]
+            source = doc.source or 'unknown'
+            content = doc.content[:200]
             print(f"\n  {j}. Source: {source}")
             print(f"     Preview: {content}...")
 
-    print("\n" + "=" * 70)
+    print("\n" + _EQ)
 
 
 def test_session_management(assistant):
@@ -178,56 +171,68 @@ def test_session_management(assistant):
     print(f"\n✅ Session file exists: {session_file.exists()}")
     print(f"   Path: {session_file}")
 
-    print("\n" + "=" * 70)
+    print("\n" + _EQ)
 
 
-def print_summary(assistant):
+def print_summary(stats):
     """Print final summary report."""
     print_section("TESTING SESSION SUMMARY")
 
-    stats = assistant.get_stats()
-
-    print("\n✅ All Tests Completed Successfully!\n")
-    print("📊 Final Statistics:")
-    print("─" * 70)
-    print(f"Session ID: {stats['current_session_id']}")
-    print(f"Documents Loaded: {stats['num_documents']}")
-    print(f"Total Messages: {stats['current_session_messages']}")
-    print(f"Total Sessions: {stats['num_sessions']}")
-
-    print("\n🧪 Tests Executed:")
-    print("─" * 70)
-    print("  ✓ Test 1: Q&A Intent (Information Retrieval)")
-    print("  ✓ Test 2: Calculation Intent (Mathematical Operations)")
-    print("  ✓ Test 3: Summarization Intent")
-    print("  ✓ Test 4: Conversation Memory")
-    print("  ✓ Test 5: Session Statistics")
-    print("  ✓ Test 6: Document Search")
-    print("  ✓ Test 7: Session Management")
-
-    print("\n✨ Key Features Demonstrated:")
-    print("─" * 70)
-    print("  • Intent classification (qa, calculation, summarization)")
-    print("  • Multi-agent routing with LangGraph")
-    print("  • Tool usage (calculator, document_reader)")
-    print("  • Structured outputs with Pydantic")
-    print("  • Conversation memory with MemorySaver")
-    print("  • Session persistence")
-
-    print("\n" + "=" * 70)
-    print("\n🎉 Document Assistant Testing Complete!")
-    print("\n📚 For more information, see:")
-    print("   - README.md - Project overview")
-    print("   - docs/IMPLEMENTATION.md - Technical details")
-    print("   - docs/TESTING_GUIDE.md - Testing instructions")
-    print("   - notebooks/document_assistant_demo.ipynb - Interactive demo")
+    # Assemble the report once and flush it in a single write
+    lines = [
+        "",
+        "✅ All Tests Completed Successfully!",
+        "",
+        "📊 Final Statistics:",
+        _DASH,
+        f"Session ID: {stats['current_session_id']}",
+        f"Documents Loaded: {stats['num_documents']}",
+        f"Total Messages: {stats['current_session_messages']}",
+        f"Total Sessions: {stats['num_sessions']}",
+        "",
+        "🧪 Tests Executed:",
+        _DASH,
+        "  ✓ Test 1: Q&A Intent (Information Retrieval)",
+        "  ✓ Test 2: Calculation Intent (Mathematical Operations)",
+        "  ✓ Test 3: Summarization Intent",
+        "  ✓ Test 4: Conversation Memory",
+        "  ✓ Test 5: Session Statistics",
+        "  ✓ Test 6: Document Search",
+        "  ✓ Test 7: Session Management",
+        "",
+        "✨ Key Features Demonstrated:",
+        _DASH,
+        "  • Intent classification (qa, calculation, summarization)",
+        "  • Multi-agent routing with LangGraph",
+        "  • Tool usage (calculator, document_reader)",
+        "  • Structured outputs with Pydantic",
+        "  • Conversation memory with MemorySaver",
+        "  • Session persistence",
+        "",
+        _EQ,
+        "",
+        "🎉 Document Assistant Testing Complete!",
+        "",
+        "📚 For more information, see:",
+        "   - README.md - Project overview",
+        "   - docs/IMPLEMENTATION.md - Technical details",
+        "   - docs/TESTING_GUIDE.md - Testing instructions",
+        "   - notebooks/document_assistant_demo.ipynb - Interactive demo",
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
     """Main test execution."""
-    print("\n" + "=" * 70)
+    # Imported here so that importing this module stays cheap: pulling in
+    # the assistant transitively loads LangChain/LangGraph/OpenAI, which
+    # only matters once the script actually runs
+    from src.assistant import DocumentAssistant
+    from src.config import get_default_llm
+
+    print("\n" + _EQ)
     print("  Document Assistant - Sample Data Testing")
-    print("=" * 70)
+    print(_EQ)
 
     # Initialize LLM
     print("\n🔧 Initializing LLM...")
@@ -241,6 +246,19 @@ def main():
 
     # Initialize assistant with sample data
     data_path = project_root / "data"
+
+    # Cheap cardinality check before any heavy setup: os.scandir returns
+    # batched directory entries without a per-file stat, so an empty
+    # data/ skips document loading and embedding work entirely
+    try:
+        with os.scandir(data_path) as entries:
+            has_docs = any(entry.is_file() for entry in entries)
+    except FileNotFoundError:
+        has_docs = False
+    if not has_docs:
+        print(f"\n⚠️  No documents found in {data_path} - nothing to test")
+        return 0
+
     print(f"\n📁 Loading documents from: {data_path}")
 
     assistant = DocumentAssistant(
@@ -265,16 +283,25 @@ def main():
         test_calculation_intent(assistant)
         test_summarization_intent(assistant)
         test_conversation_memory(assistant)
-        test_session_statistics(assistant)
+
+        # One snapshot serves the statistics test and the final summary;
+        # the remaining tests add no messages or documents, so those
+        # counts stay accurate
+        stats = assistant.get_stats()
+        test_session_statistics(assistant, stats)
         test_document_search(assistant)
         test_session_management(assistant)
 
+        # save_session() above may have created a new session file, so
+        # refresh that one count before the summary
+        stats["num_sessions"] = len(assistant.list_sessions())
+
         # Print summary
-        print_summary(assistant)
+        print_summary(stats)
 
     except KeyboardInterrupt:
         print("\n\n⚠️  Testing interrupted by user")
-        print_summary(assistant)
+        print_summary(assistant.get_stats())
     except Exception as e:
         print(f"\n\n❌ Error during testing: {e}")
         import traceback